@@ -0,0 +1,63 @@
+import queue
+import threading
+
+# In-process pub/sub for alerts. database.log_alert publishes here right after the
+# row is committed; the SSE stream and webhook dispatcher subscribe.
+
+_lock = threading.Lock()
+_subscribers = []
+_version = 0
+
+class Subscription:
+    """A bounded queue of alerts, optionally limited to a set of tickers."""
+
+    def __init__(self, tickers=None, maxsize=1000):
+        self.tickers = {t.upper() for t in tickers} if tickers else None
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def matches(self, alert):
+        return self.tickers is None or alert["ticker"].upper() in self.tickers
+
+    def put(self, alert):
+        # Slow consumers lose their oldest alerts instead of blocking the pipeline
+        while True:
+            try:
+                self.queue.put_nowait(alert)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """Returns the next alert, or None if nothing arrived within `timeout` seconds."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+def subscribe(tickers=None, maxsize=1000):
+    sub = Subscription(tickers, maxsize)
+    with _lock:
+        _subscribers.append(sub)
+    return sub
+
+def unsubscribe(sub):
+    with _lock:
+        if sub in _subscribers:
+            _subscribers.remove(sub)
+
+def publish(alert):
+    """Fans an alert dict (id, ticker, alert_type, message, timestamp) out to matching subscribers."""
+    global _version
+    with _lock:
+        _version += 1
+        subs = list(_subscribers)
+    for sub in subs:
+        if sub.matches(alert):
+            sub.put(alert)
+
+def version():
+    """Monotonic counter of published alerts; cheap cache key for alert reads."""
+    return _version
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import alert_bus
+import database as db
+
+STREAM_HOST = os.getenv("SENTINEL_STREAM_HOST", "127.0.0.1")
+STREAM_PORT = int(os.getenv("SENTINEL_STREAM_PORT", "8502"))
+WEBHOOK_URL = os.getenv("SENTINEL_WEBHOOK_URL")
+WEBHOOK_BATCH_SECONDS = float(os.getenv("SENTINEL_WEBHOOK_BATCH_SECONDS", "5"))
+WEBHOOK_MAX_BATCH = 100
+KEEPALIVE_SECONDS = 15
+RELAY_SECONDS = 1.0
+
+def parse_tickers(values):
+    """?ticker=A,B&ticker=C -> {'A', 'B', 'C'} (None means every ticker)."""
+    tickers = {t.strip().upper() for v in values or [] for t in v.split(",") if t.strip()}
+    return tickers or None
+
+# --- SERVER-SENT EVENTS ---
+
+class AlertStreamHandler(BaseHTTPRequestHandler):
+    """GET /alerts?ticker=RELIANCE.NS,TCS.NS streams matching alerts as SSE; GET /health for probes."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.end_headers()
+            self.wfile.write(b"ok")
+            return
+        if url.path != "/alerts":
+            self.send_error(404)
+            return
+
+        sub = alert_bus.subscribe(parse_tickers(parse_qs(url.query).get("ticker")))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            self.wfile.flush()
+            while True:
+                alert = sub.get(timeout=KEEPALIVE_SECONDS)
+                if alert is None:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    self.wfile.write(f"id: {alert['id']}\nevent: alert\ndata: {json.dumps(alert)}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass # Client went away
+        finally:
+            alert_bus.unsubscribe(sub)
+
+    def log_message(self, format, *args):
+        pass # Keep the dashboard console quiet
+
+def start_stream_server(host=STREAM_HOST, port=STREAM_PORT):
+    """Serves the SSE endpoint from a daemon thread. Returns the server (None if the port is taken)."""
+    try:
+        server = ThreadingHTTPServer((host, port), AlertStreamHandler)
+    except OSError as e:
+        print(f"Alert stream not started on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="alert-stream", daemon=True).start()
+    return server
+
+# --- BATCHED WEBHOOKS ---
+
+def post_batch(url, batch):
+    import requests
+    try:
+        requests.post(url, json={"alerts": batch}, timeout=5)
+    except Exception as e:
+        print(f"Webhook delivery failed ({len(batch)} alerts): {e}")
+
+def run_webhook(url, tickers=None, interval=WEBHOOK_BATCH_SECONDS, max_batch=WEBHOOK_MAX_BATCH):
+    """Collects alerts for up to `interval` seconds (or `max_batch` alerts) and POSTs them together."""
+    sub = alert_bus.subscribe(tickers)
+    while True:
+        first = sub.get()
+        batch = [first]
+        deadline = time.monotonic() + interval
+        while len(batch) < max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: break
+            alert = sub.get(timeout=remaining)
+            if alert is None: break
+            batch.append(alert)
+        post_batch(url, batch)
+
+def start_webhook(url, tickers=None):
+    threading.Thread(target=run_webhook, args=(url, tickers), name="alert-webhook", daemon=True).start()
+
+# --- CROSS-PROCESS RELAY ---
+
+def run_db_relay(interval=RELAY_SECONDS):
+    """
+    Republishes alerts committed by other processes (ingestion workers, the screener) on this
+    process's bus. Rows are held for one extra poll, so alerts this process logged itself
+    have been published locally by then and are skipped.
+    """
+    local = alert_bus.subscribe()
+    seen = set()
+    last_id = db.get_last_alert_id()
+    pending = []
+    while True:
+        time.sleep(interval)
+        try:
+            while (alert := local.get(timeout=0)) is not None:
+                seen.add(alert["id"])
+            for alert in pending:
+                if alert["id"] not in seen:
+                    alert_bus.publish(alert)
+            seen = {i for i in seen if i > last_id}
+            pending = db.fetch_alerts_after(last_id)
+            if pending:
+                last_id = pending[-1]["id"]
+        except Exception as e:
+            print(f"Alert relay failed: {e}")
+
+def start_db_relay():
+    threading.Thread(target=run_db_relay, name="alert-relay", daemon=True).start()
+
+def start_services():
+    """
+    Starts the SSE endpoint, the relay for alerts logged by other processes and, if
+    SENTINEL_WEBHOOK_URL is set, webhook delivery. Run it in one process per deployment.
+    """
+    server = start_stream_server()
+    start_db_relay()
+    if WEBHOOK_URL:
+        start_webhook(WEBHOOK_URL, parse_tickers([os.getenv("SENTINEL_WEBHOOK_TICKERS", "")]))
+    return server
@@ -1,20 +1,59 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go 
 import database as db
 import backend as bk
+import alert_bus
+import alert_stream
+from sharding import LEASE_SECONDS
+from scheduler import PollScheduler, run_due
 import time
+import perf
 from datetime import datetime, timedelta
 
+perf.mark("init") # Section marks are no-ops unless a profiler (loadtest.py) enables them
+
 # --- Page Config ---
 st.set_page_config(page_title="PBL Project 3.0", page_icon="📈", layout="wide")
 
-# Initialize DB
-db.init_db()
+# Initialize DB once per process instead of on every rerun
+@st.cache_resource
+def init_database():
+    db.init_db()
+    return True
+
+init_database()
+
+# Alert push services (SSE endpoint + optional webhooks) run once per process
+@st.cache_resource
+def start_alert_services():
+    return alert_stream.start_services()
+
+start_alert_services()
+
+# Alerts are re-read only when the bus publishes a new one in this process
+# (alerts from headless workers arrive through the alert relay); the TTL is a backstop.
+@st.cache_data(ttl=60, show_spinner=False)
+def load_recent_alerts(limit, bus_version):
+    return db.fetch_recent_alerts(limit)
 
 # --- HELPER FUNCTIONS ---
 
+@st.cache_resource
+def get_scheduler():
+    return PollScheduler()
+
+def run_ingestion(force=False):
+    """
+    Runs ingestion in-process unless sharded workers (worker.py) already own it.
+    Auto-refresh only polls what the market-hours scheduler says is due; `force` polls everything.
+    """
+    workers = db.get_live_workers(time.time() - LEASE_SECONDS)
+    if workers: return f"Ingestion handled by {len(workers)} worker(s)."
+    if force: return bk.run_pipeline()
+    # Workers refresh the peer map from shard 0's owner; without them the dashboard keeps it on schedule
+    bk.maybe_refresh_peer_map()
+    return run_due(db.get_tracked_stocks(), get_scheduler())
+
 def get_time_ago(timestamp_str):
     try:
         dt = pd.to_datetime(timestamp_str)
@@ -61,6 +100,7 @@ def get_smart_tags(title):
     return tags
 
 # --- SIDEBAR ---
+perf.mark("sidebar")
 st.sidebar.title("PBL Project 3.0")
 st.sidebar.markdown("**Real-Time Sentiment & Anomaly Alert System**")
 
@@ -98,15 +138,27 @@ auto_refresh = st.sidebar.checkbox("Enable Auto-Refresh (1 min)")
 
 if auto_refresh:
     with st.spinner("Syncing with Market..."):
-        status = bk.run_pipeline()
+        status = run_ingestion()
         time.sleep(60) 
         st.rerun()
 
 if st.sidebar.button("🔄 Manual Refresh"):
     with st.spinner("Fetching Data..."):
-        status = bk.run_pipeline()
+        status = run_ingestion(force=True)
     st.sidebar.success(status)
 
+# 4. Data Source Health (circuit breakers)
+unhealthy = db.fetch_unhealthy_sources()
+if not unhealthy.empty:
+    st.sidebar.divider()
+    st.sidebar.subheader("🩺 Source Health")
+    for _, row in unhealthy.iterrows():
+        if row['state'] == "open":
+            retry = max(0, int((row['retry_at'] - time.time()) / 60))
+            st.sidebar.warning(f"**{row['name']}** paused, retry in ~{retry} min\n\n{row['last_error']}")
+        else:
+            st.sidebar.caption(f"{row['name']}: {row['state']} ({row['last_error'] or 'probing'})")
+
 st.sidebar.divider()
 st.sidebar.markdown("### 🛠 Project Details")
 st.sidebar.info("Team 10\nCourse: Cloud Computing\nCode: 22CBS73")
@@ -114,12 +166,13 @@ st.sidebar.info("Team 10\nCourse: Cloud Computing\nCode: 22CBS73")
 # --- MAIN DASHBOARD ---
 
 # 1. PREPARE DATA
+perf.mark("alert_banner")
 stocks = db.get_tracked_stocks()
 tracked_tickers = [s['ticker'] for s in stocks] if stocks else []
 
 # 2. GLOBAL ALERT BANNER (Filtered & Time-Limited)
 if tracked_tickers:
-    all_alerts = db.fetch_recent_alerts(20)
+    all_alerts = load_recent_alerts(20, alert_bus.version())
     
     if not all_alerts.empty:
         active_alerts = all_alerts[all_alerts['ticker'].isin(tracked_tickers)]
@@ -166,11 +219,13 @@ if tracked_tickers:
                 """, unsafe_allow_html=True)
 
 # 3. STOCK DATA GRID
+perf.mark("grid")
 st.subheader("📊 Market Intelligence Dashboard")
 
 if not stocks:
     st.info("System Ready. Add a stock in the sidebar to begin analysis.")
 else:
+    states = db.fetch_ticker_states(tracked_tickers)
     tabs = st.tabs([s['ticker'] for s in stocks])
     
     for i, stock in enumerate(stocks):
@@ -188,29 +243,24 @@ else:
 
             # --- SUB-TAB 1: Price & Overview ---
             with sub_tab1:
-                conn = db.get_connection()
-                sent_df = pd.read_sql(f"SELECT * FROM sentiment_data WHERE ticker='{t}' ORDER BY id DESC LIMIT 20", conn)
-                current_sent = sent_df['sentiment_score'].mean() if not sent_df.empty else 0.0
-                
-                vol_df = pd.read_sql(f"SELECT volume FROM market_data WHERE ticker='{t}' ORDER BY id DESC LIMIT 20", conn)
-                conn.close()
-                
-                current_z = 0.0
-                if len(vol_df) > 5:
-                    vols = vol_df['volume'].values
-                    mean_vol = vols.mean()
-                    std_vol = vols.std()
-                    if std_vol > 0:
-                        current_z = (vols[0] - mean_vol) / std_vol
-
-                ai_text = bk.generate_ai_summary(current_sent, current_z)
+                perf.mark("overview")
+                import plotly.graph_objects as go # Deferred: only needed once a stock is tracked
+                import charting
+                # Everything below comes from the pipeline-maintained ticker_state row
+                state = states.get(t, {})
+                current_sent = state.get('sentiment') or 0.0
+                current_z = state.get('current_z') or 0.0
+                ai_text = state.get('ai_summary') or bk.generate_ai_summary(current_sent, current_z)
                 st.info(f"🤖 **AI Executive Brief:** {ai_text}")
+                if state.get('updated_at'):
+                    price_age = get_time_ago(state['price_updated_at']) if state['price_updated_at'] else "never"
+                    news_age = get_time_ago(state['news_updated_at']) if state['news_updated_at'] else "never"
+                    st.caption(f"Price updated: {price_age} • News updated: {news_age} • {state['alert_count']} alerts logged")
 
-                stock_alerts = db.fetch_recent_alerts(10)
-                stock_alerts = stock_alerts[stock_alerts['ticker'] == t]
-                if not stock_alerts.empty:
+                stock_alerts = state.get('recent_alerts', [])
+                if stock_alerts:
                     with st.expander(f"🚨 Recent Alerts for {t}", expanded=True):
-                        for ix, row in stock_alerts.head(3).iterrows():
+                        for row in stock_alerts[:3]:
                             st.caption(f"{get_time_ago(row['timestamp'])}: {row['message']}")
 
                 col1, col2 = st.columns([2, 1])
@@ -230,19 +280,8 @@ else:
                         hist_df = bk.fetch_historical_data(t, period=period_map[timeframe])
 
                     if hist_df is not None and not hist_df.empty:
-                        fig = go.Figure()
-                        fig.add_trace(go.Candlestick(x=hist_df.index, open=hist_df['Open'], high=hist_df['High'], low=hist_df['Low'], close=hist_df['Close'], name='Price'))
-                        if len(hist_df) > 21:
-                            hist_df['SMA_21'] = hist_df['Close'].rolling(window=21).mean()
-                            fig.add_trace(go.Scatter(x=hist_df.index, y=hist_df['SMA_21'], mode='lines', name='SMA 21', line=dict(color='yellow', width=1)))
-                        if len(hist_df) > 50:
-                            hist_df['SMA_50'] = hist_df['Close'].rolling(window=50).mean()
-                            fig.add_trace(go.Scatter(x=hist_df.index, y=hist_df['SMA_50'], mode='lines', name='SMA 50', line=dict(color='orange', width=1)))
-                        if len(hist_df) > 200:
-                            hist_df['SMA_200'] = hist_df['Close'].rolling(window=200).mean()
-                            fig.add_trace(go.Scatter(x=hist_df.index, y=hist_df['SMA_200'], mode='lines', name='SMA 200', line=dict(color='red', width=1)))
-                        fig.update_layout(title=f"{t} - {timeframe} Chart", yaxis_title="Price", xaxis_rangeslider_visible=False, template="plotly_dark", height=400)
-                        st.plotly_chart(fig, use_container_width=True)
+                        fig = charting.build_price_figure(hist_df, f"{t} - {timeframe} Chart")
+                        st.plotly_chart(fig, use_container_width=True, key=f"price_chart_{t}_{i}")
                     else:
                         st.warning("Could not load chart data.")
 
@@ -267,7 +306,7 @@ else:
                         }
                     ))
                     fig_gauge.update_layout(height=250, margin=dict(l=20, r=20, t=30, b=20), paper_bgcolor="#262730", font={'color': "white"})
-                    st.plotly_chart(fig_gauge, use_container_width=True)
+                    st.plotly_chart(fig_gauge, use_container_width=True, key=f"gauge_{t}_{i}")
                     
                     st.markdown("#### ⚔️ Peer Clash")
                     peers = bk.get_peers(t)
@@ -281,6 +320,7 @@ else:
 
             # --- SUB-TAB 2: Fundamentals ---
             with sub_tab2:
+                perf.mark("fundamentals")
                 st.markdown(f"### 🏢 Deep Dive: {t}")
                 with st.spinner("Fetching full fundamental report..."):
                     fund = bk.fetch_fundamentals(t)
@@ -308,6 +348,7 @@ else:
 
             # --- SUB-TAB 3: News ---
             with sub_tab3:
+                perf.mark("news")
                 st.markdown("#### 📰 Recent Headlines")
                 conn = db.get_connection()
                 news_df = pd.read_sql(f"SELECT * FROM sentiment_data WHERE ticker='{t}' AND source != 'Reddit' ORDER BY id DESC LIMIT 10", conn)
@@ -332,6 +373,7 @@ else:
 
             # --- SUB-TAB 4: Social & Experts ---
             with sub_tab4:
+                perf.mark("social")
                 col_expert, col_social = st.columns([1, 1])
                 with col_expert:
                     st.markdown("#### 🧠 Expert Consensus")
@@ -358,7 +400,7 @@ else:
                     whisper_mode = st.toggle("🕵️ Activate Whisper Mode", key=f"whisper_{t}_{i}") # FIX: Unique Key
                     
                     with st.spinner("Scanning Forums..."):
-                        reddit_posts = bk.fetch_reddit_posts(term)
+                        reddit_posts = db.fetch_reddit_posts(t) # Ingested by the pipeline, no API call per render
                         vp_posts = bk.fetch_valuepickr_threads(term)
                     all_posts = []
                     if reddit_posts: all_posts.extend(reddit_posts)
@@ -387,6 +429,7 @@ else:
 
             # --- SUB-TAB 5: Alert Config ---
             with sub_tab5:
+                perf.mark("alert_config")
                 st.markdown(f"### ⚙️ Configure Alerts for {t}")
                 st.markdown("Adjust the sensitivity of the monitoring system for this specific stock.")
                 with st.form(f"config_form_{t}"):
@@ -403,4 +446,6 @@ else:
                         db.update_stock_thresholds(t, new_s_thresh, new_a_thresh)
                         st.success(f"Settings updated for {t}!")
                         time.sleep(1)
-                        st.rerun()
\ No newline at end of file
+                        st.rerun()
+
+perf.mark(None)
@@ -1,31 +1,47 @@
-import yfinance as yf
-import feedparser
 import numpy as np
-import praw
 import os
-import requests
 import re
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import database as db
+import circuit
+from universe import load_universe
 
 # Load Environment Variables
 load_dotenv()
 
-# Initialize NLP Engine
-analyzer = SentimentIntensityAnalyzer()
+# Heavy clients (VADER lexicon, praw, yfinance, feedparser) load on first use,
+# so importing this module stays cheap for the dashboard.
+_analyzer = None
+_reddit = None
+_reddit_checked = False
 
-# Initialize Reddit
-reddit = None
-if os.getenv("REDDIT_CLIENT_ID") and os.getenv("REDDIT_CLIENT_SECRET"):
-    try:
-        reddit = praw.Reddit(
-            client_id=os.getenv("REDDIT_CLIENT_ID"),
-            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-            user_agent="PBL_Project_3.0_Bot_v1"
-        )
-    except Exception as e:
-        print(f"Reddit Auth Error: {e}")
+def get_analyzer():
+    """Returns the shared VADER analyzer, loading the lexicon on first use."""
+    global _analyzer
+    if _analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+def get_reddit():
+    """Returns the shared Reddit client, or None when credentials are missing."""
+    global _reddit, _reddit_checked
+    if not _reddit_checked:
+        _reddit_checked = True
+        if os.getenv("REDDIT_CLIENT_ID") and os.getenv("REDDIT_CLIENT_SECRET"):
+            try:
+                import praw
+                _reddit = praw.Reddit(
+                    client_id=os.getenv("REDDIT_CLIENT_ID"),
+                    client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+                    user_agent="PBL_Project_3.0_Bot_v1"
+                )
+            except Exception as e:
+                print(f"Reddit Auth Error: {e}")
+    return _reddit
 
 # --- HELPER FUNCTIONS ---
 
@@ -37,18 +53,26 @@ def clean_html(raw_html):
 
 def fetch_market_price(ticker):
     """Fetches real-time price from Yahoo Finance."""
+    # Per-ticker breaker: a delisted or mistyped symbol stops costing a request every cycle
+    breaker = circuit.get_breaker("yfinance", ticker)
+    if not breaker.allow(): return None, None
+    import yfinance as yf
     try:
         stock = yf.Ticker(ticker)
         data = stock.history(period="1d", interval="1m")
         if not data.empty:
+            breaker.record_success()
             latest = data.iloc[-1]
             return latest['Close'], int(latest['Volume'])
+        breaker.record_failure("No price data (possibly delisted)")
     except Exception as e:
+        breaker.record_failure(e)
         print(f"Error fetching price for {ticker}: {e}")
     return None, None
 
 def fetch_historical_data(ticker, period="1mo"):
     """Fetches historical OHLC data for charting."""
+    import yfinance as yf
     try:
         stock = yf.Ticker(ticker)
         # Adjust interval based on period for best chart appearance
@@ -66,6 +90,7 @@ def fetch_fundamentals(ticker):
     """
     Fetches extended fundamental data including Valuation, Profitability, and Health.
     """
+    import yfinance as yf
     try:
         stock = yf.Ticker(ticker)
         info = stock.info
@@ -106,6 +131,7 @@ def fetch_fundamentals(ticker):
 
 def fetch_analyst_data(ticker):
     """Fetches Analyst Ratings and Price Targets."""
+    import yfinance as yf
     try:
         stock = yf.Ticker(ticker)
         info = stock.info
@@ -131,10 +157,19 @@ def fetch_valuepickr_threads(search_term):
     headers = {"User-Agent": "Mozilla/5.0"}
     
     discussions = []
+    breaker = circuit.get_breaker("valuepickr")
+    if not breaker.allow(): return discussions
     try:
+        import requests
         r = requests.get(url, params=params, headers=headers, timeout=5)
+        r.raise_for_status()
         data = r.json()
-        
+    except Exception as e:
+        breaker.record_failure(e)
+        return discussions
+    breaker.record_success()
+
+    try:
         if 'topics' in data:
             for topic in data['topics']:
                 title = topic.get('title', 'No Title')
@@ -144,7 +179,7 @@ def fetch_valuepickr_threads(search_term):
                 slug = topic.get('slug', '')
                 topic_id = topic.get('id', '')
                 post_url = f"https://forum.valuepickr.com/t/{slug}/{topic_id}"
-                sentiment = analyzer.polarity_scores(title)['compound']
+                sentiment = get_analyzer().polarity_scores(title)['compound']
                 
                 discussions.append({
                     "source": "ValuePickr Forum",
@@ -157,40 +192,87 @@ def fetch_valuepickr_threads(search_term):
         pass
     return discussions[:10]
 
-def fetch_reddit_posts(search_term, limit=15):
+REDDIT_SUBREDDITS = ["IndianStreetBets", "DalalStreetTalks", "IndianStockMarket", "IndiaInvestments", "stocks"]
+REDDIT_MAX_QUERY_CHARS = 400
+REDDIT_MAX_RESULTS = 1000    # Reddit listings end here anyway; PRAW pages through them 100 at a time
+REDDIT_INITIAL_LOOKBACK = 7 * 24 * 3600
+REDDIT_REFRESH_WINDOW = 3 * 24 * 3600    # Stored posts this young get their score/comments re-read each pass
+
+def reddit_term(search_term):
+    return search_term.split('.')[0].strip()
+
+def reddit_batches(stocks):
+    """Groups (ticker, term) pairs so each OR query stays under Reddit's search length limit."""
+    batch, length = [], 0
+    for stock in stocks:
+        term = reddit_term(stock['search_term'])
+        if batch and length + len(term) + 6 > REDDIT_MAX_QUERY_CHARS:
+            yield batch
+            batch, length = [], 0
+        batch.append((stock['ticker'], term))
+        length += len(term) + 6 # Quotes and " OR "
+    if batch:
+        yield batch
+
+def ingest_reddit(stocks):
     """
-    Fetches Reddit posts with STRICT FILTERING.
+    Incrementally ingests Reddit posts for many tickers: one multireddit search per batch,
+    newest first, paging until it reaches the batch's lowest high-water mark. Returns {ticker: [new post dicts]}.
     """
-    if not reddit: return None 
-    clean_term = search_term.split('.')[0].strip()
-    posts_data = []
+    breaker = circuit.get_breaker("reddit")
+    reddit = get_reddit()
+    if not reddit:
+        breaker.disable("Missing or invalid Reddit credentials")
+        return {}
+    if not stocks or not breaker.allow(): return {}
+
+    multi = reddit.subreddit("+".join(REDDIT_SUBREDDITS))
+    cursors = db.get_reddit_cursors([s['ticker'] for s in stocks])
+    default_floor = datetime.now().timestamp() - REDDIT_INITIAL_LOOKBACK
+    new_posts = {}
+
     try:
-        subreddits = ["IndianStreetBets", "DalalStreetTalks", "IndianStockMarket", "IndiaInvestments", "stocks"]
-        query = f"{clean_term}"
-        
-        for post in reddit.subreddit("all").search(query, sort='relevance', time_filter='month', limit=limit):
-            # Strict Filter
-            if clean_term.lower() not in post.title.lower(): continue
-            
-            # Subreddit Filter
-            is_relevant = post.subreddit.display_name in subreddits or "stock" in post.subreddit.display_name.lower() or "invest" in post.subreddit.display_name.lower()
-            
-            if is_relevant:
-                sentiment = analyzer.polarity_scores(post.title)['compound']
-                posts_data.append({
-                    "source": f"r/{post.subreddit.display_name}",
-                    "title": post.title,
-                    "url": post.url,
-                    "sentiment": sentiment,
-                    "score": post.score,
-                    "comments": post.num_comments
-                })
-    except Exception:
-        pass
-    return posts_data
+        for batch in reddit_batches(stocks):
+            floors = {t: cursors.get(t, default_floor) for t, _ in batch}
+            query = " OR ".join(f'"{term}"' for _, term in batch)
+            rows = []
+            newest = max(floors.values())
+            for post in multi.search(query, sort='new', time_filter='week', limit=REDDIT_MAX_RESULTS):
+                # Results are newest first, so everything past the lowest cursor was seen already
+                if post.created_utc <= min(floors.values()): break
+                newest = max(newest, post.created_utc)
+                title_lower = post.title.lower()
+                for ticker, term in batch:
+                    if term.lower() not in title_lower or post.created_utc <= floors[ticker]: continue
+                    sentiment = get_analyzer().polarity_scores(post.title)['compound']
+                    rows.append((post.id, ticker, post.subreddit.display_name, post.title, post.url, 
+                                 post.score, post.num_comments, sentiment, post.created_utc))
+                    new_posts.setdefault(ticker, []).append({"title": post.title, "sentiment": sentiment})
+            # Every post down to the lowest cursor was read (or the listing ran out), so the whole batch
+            # advances to the newest post seen
+            db.save_reddit_posts(rows, {t: newest for t, _ in batch})
+        refresh_reddit_scores(reddit, [s['ticker'] for s in stocks])
+    except Exception as e:
+        breaker.record_failure(e)
+        return new_posts
+    breaker.record_success()
+    return new_posts
+
+def refresh_reddit_scores(reddit, tickers):
+    """
+    Re-reads score and comment counts of stored posts from the last REDDIT_REFRESH_WINDOW.
+    Posts are ingested minutes after they are created, so their first counts are near zero.
+    """
+    since = datetime.now().timestamp() - REDDIT_REFRESH_WINDOW
+    rows = db.get_recent_reddit_posts(tickers, since)
+    if not rows: return
+    # PRAW looks fullnames up 100 per request
+    latest = {p.id: (p.score, p.num_comments) for p in reddit.info(fullnames=[f"t3_{i}" for i in {r[0] for r in rows}])}
+    rows = [r[:5] + latest[r[0]] + r[7:] for r in rows if r[0] in latest]
+    db.save_reddit_posts(rows, {})
 
-def fetch_news_sentiment(ticker, search_term):
-    """Fetches news from MULTIPLE RSS Sources."""
+def fetch_news_articles(search_term):
+    """Fetches and scores headlines from MULTIPLE RSS Sources (no DB writes)."""
     clean_term = search_term.replace(" ", "%20")
     rss_sources = [
         f"https://news.google.com/rss/search?q={clean_term}&hl=en-IN&gl=IN&ceid=IN:en",
@@ -200,20 +282,27 @@ def fetch_news_sentiment(ticker, search_term):
         f"https://news.google.com/rss/search?q={clean_term}+site:livemint.com&hl=en-IN&gl=IN&ceid=IN:en"
     ]
     
-    scores = []
+    breaker = circuit.get_breaker("google-news")
+    if not breaker.allow(): return []
+
+    import feedparser
     articles = []
     seen_links = set()
+    errors = []
     
     for url in rss_sources:
         try:
             feed = feedparser.parse(url)
+            if feed.get("bozo") and not feed.entries:
+                errors.append(feed.get("bozo_exception", "Unreadable feed"))
+                continue
             for entry in feed.entries[:3]:
                 title = entry.title
                 link = entry.link
                 if link in seen_links: continue
                 seen_links.add(link)
                 
-                sentiment = analyzer.polarity_scores(title)['compound']
+                sentiment = get_analyzer().polarity_scores(title)['compound']
                 
                 # Identify Source
                 source_name = "News"
@@ -223,15 +312,18 @@ def fetch_news_sentiment(ticker, search_term):
                 elif "yahoo" in link: source_name = "Yahoo Finance"
                 else: source_name = "Google News"
                 
-                db.log_sentiment(ticker, source_name, title, sentiment)
-                scores.append(sentiment)
-                articles.append((title, sentiment, link))
-        except Exception:
-            pass
+                articles.append({"source": source_name, "title": title, "sentiment": sentiment, "link": link})
+        except Exception as e:
+            errors.append(e)
             
-    avg_score = np.mean(scores) if scores else 0.0
-    return avg_score, articles
+    # One readable feed is enough to call the source healthy
+    if len(errors) == len(rss_sources):
+        breaker.record_failure(errors[0])
+    else:
+        breaker.record_success()
+    return articles
 
+# Static fallback used until the first peer discovery run has populated `peer_map`
 PEER_MAP = {
     "RELIANCE.NS": ["TATASTEEL.NS", "ADANIENT.NS"],
     "TCS.NS": ["INFY.NS", "WIPRO.NS"],
@@ -239,13 +331,149 @@ PEER_MAP = {
     "INFY.NS": ["TCS.NS", "HCLTECH.NS"],
     "TATAMOTORS.NS": ["MARUTI.NS", "ASHOKLEY.NS"],
     "ADANIENT.NS": ["RELIANCE.NS", "TATASTEEL.NS"],
-    # Add more as needed
 }
 
+PEER_COUNT = 3
+PEER_LOOKBACK = "6mo"
+PEER_LOOKBACK_DAYS = 185
+PEER_MIN_OVERLAP = 20      # Minimum shared return days for a correlation to count
+PEER_REFRESH_HOURS = 24
+
 def get_peers(ticker):
     """Returns a list of peer tickers for a given stock."""
+    peers = db.get_peers(ticker, PEER_COUNT)
+    if peers: return peers
     return PEER_MAP.get(ticker, ["^NSEI"]) # Default to Nifty 50 if unknown
 
+def fetch_daily_closes(tickers, period=PEER_LOOKBACK):
+    """
+    Brings the cached daily closes up to date with batched downloads: tickers with a cache
+    resume from their latest cached day (re-fetched, it may have been partial), new ones get the full `period`.
+    """
+    latest = db.get_daily_marks(tickers)
+    floor = (datetime.now() - timedelta(days=PEER_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+    groups = {}
+    for t in tickers:
+        start = latest.get(t)
+        groups.setdefault(start if start and start >= floor else None, []).append(t)
+
+    rows = []
+    for start, group in groups.items():
+        rows += download_daily_closes(group, start=start) if start else download_daily_closes(group, period=period)
+    db.save_daily_closes(rows)
+    return len(rows)
+
+def download_daily_closes(tickers, **span):
+    """One batched yfinance call for `tickers` over `span` (period= or start=). Returns (ticker, date, close) rows."""
+    import yfinance as yf
+    try:
+        data = yf.download(tickers, interval="1d", progress=False, auto_adjust=True, threads=True, **span)
+    except Exception as e:
+        print(f"Error downloading daily bars: {e}")
+        return []
+    if data is None or data.empty: return []
+
+    closes = data["Close"]
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(tickers[0])
+    stacked = closes.stack().dropna()
+    return [(t, d.strftime("%Y-%m-%d"), float(c)) for (d, t), c in stacked.items()]
+
+def return_correlation_matrix(closes):
+    """
+    Pairwise correlation of daily log returns for every ticker column, in one vectorized pass.
+    Gaps (holidays, fresh listings) are NaN and only overlapping days count for each pair.
+    """
+    prices = closes.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rets = np.diff(np.log(prices), axis=0)
+    valid = np.isfinite(rets)
+    mask = valid.astype(float)
+
+    counts = mask.sum(axis=0)
+    means = np.where(valid, rets, 0.0).sum(axis=0) / np.maximum(counts, 1)
+    x = np.where(valid, rets - means, 0.0)
+
+    # Zeroed gaps drop out of every sum, so each entry only covers days both tickers traded
+    cov = x.T @ x
+    ss = (x * x).T @ mask
+    overlap = mask.T @ mask
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.sqrt(ss * ss.T)
+    corr[(overlap < PEER_MIN_OVERLAP) | ~np.isfinite(corr)] = np.nan
+    return pd.DataFrame(corr, index=closes.columns, columns=closes.columns)
+
+def rank_peers(corr, profiles, k=PEER_COUNT):
+    """
+    Ranks peers for every ticker: same industry first, then same sector,
+    then the most correlated names overall. Returns (ticker, rank, peer, correlation) rows.
+    """
+    tickers = np.array(corr.index)
+    mat = corr.to_numpy(copy=True)
+    np.fill_diagonal(mat, np.nan)
+
+    industries = np.array([(profiles.get(t) or {}).get("industry") or "N/A" for t in tickers])
+    sectors = np.array([(profiles.get(t) or {}).get("sector") or "N/A" for t in tickers])
+    same_ind = (industries[:, None] == industries[None, :]) & (industries[:, None] != "N/A")
+    same_sec = (sectors[:, None] == sectors[None, :]) & (sectors[:, None] != "N/A")
+
+    # Correlation lies in [-1, 1], so the tier bonuses never overlap
+    score = np.where(np.isnan(mat), -np.inf, mat + 4.0 * same_ind + 2.0 * same_sec)
+    order = np.argsort(-score, axis=1)[:, :k]
+
+    rows = []
+    for i, t in enumerate(tickers):
+        for rank, j in enumerate(order[i]):
+            if np.isfinite(score[i, j]):
+                rows.append((t, rank, tickers[j], float(mat[i, j])))
+    return rows
+
+def refresh_profiles(tickers):
+    """Fetches sector/industry for tickers with no stored profile (failed lookups are retried once a day)."""
+    known = db.get_ticker_profiles()
+    retry_before = datetime.now() - timedelta(hours=PEER_REFRESH_HOURS)
+    missing = [t for t in tickers if t not in known or (known[t]["sector"] is None and known[t]["updated"] < retry_before)]
+    if missing:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            funds = list(pool.map(fetch_fundamentals, missing))
+        # Failures are stored empty so they aren't fetched again on every refresh
+        db.save_ticker_profiles([(t, f["sector"], f["industry"]) if f else (t, None, None) for t, f in zip(missing, funds)])
+        known = db.get_ticker_profiles()
+    return known
+
+def refresh_peer_map(universe=None):
+    """Rebuilds the peer map for tracked + universe tickers. Returns the number of peer rows stored."""
+    tracked = [s['ticker'] for s in db.get_tracked_stocks()]
+    tickers = sorted(set(tracked) | set(universe or load_universe()))
+
+    profiles = refresh_profiles(tickers)
+    fetch_daily_closes(tickers)
+    since = (datetime.now() - timedelta(days=PEER_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+    closes = db.load_daily_closes(tickers, since)
+    if closes.empty: return 0
+
+    rows = rank_peers(return_correlation_matrix(closes), profiles)
+    db.replace_peer_map(rows)
+    return len(rows)
+
+def maybe_refresh_peer_map():
+    """
+    Refreshes peers once the map is stale or a newly tracked ticker has none. Tickers that
+    still got no peers (new listings, bad symbols, short history) wait for the next daily refresh.
+    """
+    last_attempt, mapped, attempts = db.get_peer_map_status()
+    tracked = {s['ticker'] for s in db.get_tracked_stocks()}
+    cutoff = datetime.now() - timedelta(hours=PEER_REFRESH_HOURS)
+    stale = last_attempt is None or last_attempt < cutoff
+    unmapped = {t for t in tracked - mapped if t not in attempts or attempts[t] < cutoff}
+    if stale or unmapped:
+        # Recorded up front so a failing refresh isn't retried on every tick either
+        db.mark_peer_attempts(tracked)
+        try:
+            refresh_peer_map()
+        except Exception as e:
+            print(f"Peer refresh failed: {e}")
+
 def generate_ai_summary(sentiment_score, z_score):
     """
     Generates a 'Smart Summary' based on data signals.
@@ -271,15 +499,19 @@ def generate_ai_summary(sentiment_score, z_score):
     return summary
 # --- ANALYSIS & PIPELINE ---
 
-def detect_anomalies(ticker, current_volume, threshold=3.0):
+def detect_anomalies(ticker, current_volume, threshold=3.0, conn=None):
     """
     Uses Z-Score with CUSTOM THRESHOLD passed from DB.
+    Pass `conn` to read inside an open write transaction (including its uncommitted tick).
     """
-    conn = db.get_connection()
+    own_conn = conn is None
+    if own_conn:
+        conn = db.get_connection()
     c = conn.cursor()
     c.execute("SELECT volume FROM market_data WHERE ticker=? ORDER BY id DESC LIMIT 20", (ticker,))
     rows = c.fetchall()
-    conn.close()
+    if own_conn:
+        conn.close()
     
     volumes = [r[0] for r in rows]
     if len(volumes) < 5: return False, 0.0
@@ -295,39 +527,73 @@ def detect_anomalies(ticker, current_volume, threshold=3.0):
         return True, z_score
     return False, z_score
 
-def run_pipeline():
-    """Runs the full data collection and analysis cycle."""
-    stocks = db.get_tracked_stocks()
-    summary = []
+def process_market(stock):
+    """Logs the latest bar and checks it for a volume anomaly. Returns (price, z)."""
+    ticker = stock['ticker']
+    a_thresh = stock.get('anomaly_thresh', 3.0)
     
-    if not stocks: return "No stocks tracked."
-
-    for stock in stocks:
-        ticker = stock['ticker']
-        term = stock['search_term']
-        
-        # Retrieve custom alert settings (defaulting if missing)
-        s_thresh = stock.get('sentiment_thresh', 0.2)
-        a_thresh = stock.get('anomaly_thresh', 3.0)
-        
-        # 1. Market Data & Anomaly Check
-        price, vol = fetch_market_price(ticker)
-        if price:
-            db.log_market_data(ticker, price, vol)
+    price, vol = fetch_market_price(ticker)
+    z = 0.0
+    if price:
+        # Tick, alert and dashboard state commit together
+        conn = db.get_connection()
+        alerts = []
+        with conn:
+            db.insert_market_data(conn, ticker, price, vol)
             # Pass custom anomaly threshold
-            is_anom, z = detect_anomalies(ticker, vol, threshold=a_thresh)
+            is_anom, z = detect_anomalies(ticker, vol, threshold=a_thresh, conn=conn)
             if is_anom: 
                 msg = f"Volume Spike (Z={z:.2f} > {a_thresh})"
-                db.log_alert(ticker, "ANOMALY", msg)
+                alerts.append(db.insert_alert(conn, ticker, "ANOMALY", msg))
+            db.update_ticker_state(conn, ticker, price=price, volume=vol, z=z, alerts=alerts, summarize=generate_ai_summary)
+        conn.close()
+        db.publish_alerts(alerts)
+    return price, z
 
-        # 2. News Sentiment Check
-        avg, arts = fetch_news_sentiment(ticker, term)
+def process_news(stock):
+    """Logs unseen headlines and checks the news sentiment. Returns the number of new headlines."""
+    ticker = stock['ticker']
+    s_thresh = stock.get('sentiment_thresh', 0.2)
+    
+    found = fetch_news_articles(stock['search_term'])
+    seen = db.get_recent_headlines(ticker)
+    fresh = [a for a in found if a["title"] not in seen]
+    ts = datetime.now()
+    
+    avg = np.mean([a["sentiment"] for a in found]) if found else 0.0
+    # Headlines, alert and dashboard state commit together
+    conn = db.get_connection()
+    alerts = []
+    with conn:
+        db.insert_sentiment(conn, [(ticker, a["source"], a["title"], a["sentiment"], ts) for a in fresh])
         # Check against custom sentiment threshold
         if abs(avg) > s_thresh:
             stype = "Positive" if avg > 0 else "Negative"
             msg = f"News Sentiment Shift: {stype} ({avg:.2f} > {s_thresh})"
-            db.log_alert(ticker, "SENTIMENT", msg)
-        
-        summary.append(f"{ticker}: ₹{price:.2f}")
+            alerts.append(db.insert_alert(conn, ticker, "SENTIMENT", msg))
+        db.update_ticker_state(conn, ticker, sentiment=avg if found else None, alerts=alerts, summarize=generate_ai_summary)
+    conn.close()
+    db.publish_alerts(alerts)
+    return len(fresh)
+
+def run_pipeline(stocks=None, refresh_peers=True):
+    """
+    Runs the full data collection and analysis cycle for every stock, ignoring cadence.
+    Workers pass their shard of `stocks`; only one of them should refresh peers.
+    """
+    if stocks is None:
+        stocks = db.get_tracked_stocks()
+    summary = []
+    
+    if not stocks: return "No stocks tracked."
+
+    if refresh_peers:
+        maybe_refresh_peer_map()
+
+    ingest_reddit(stocks)
+    for stock in stocks:
+        price, _ = process_market(stock)
+        process_news(stock)
+        summary.append(f"{stock['ticker']}: ₹{price:.2f}" if price else f"{stock['ticker']}: N/A")
             
-    return " | ".join(summary)
\ No newline at end of file
+    return " | ".join(summary)
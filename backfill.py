@@ -0,0 +1,122 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import yfinance as yf
+import database as db
+import backend as bk
+from universe import load_universe
+
+DEFAULT_BARS = 60      # Comfortably more than the 20-bar anomaly window
+NEWS_WORKERS = 16
+
+def default_term(ticker):
+    """Search keyword for untracked tickers: the bare symbol (RELIANCE.NS -> RELIANCE)."""
+    return ticker.split('.')[0]
+
+def backfill_prices(tickers, period="1d", bars=DEFAULT_BARS):
+    """
+    Pulls recent 1-minute bars for all tickers in one download and bulk-inserts the new ones.
+    Each ticker's dashboard state takes its last bar and that bar's z-score in the same transaction.
+    """
+    try:
+        data = yf.download(tickers, period=period, interval="1m", progress=False, threads=True, auto_adjust=False)
+    except Exception as e:
+        print(f"Error downloading minute bars: {e}")
+        return 0
+    if data is None or data.empty: return 0
+
+    closes, volumes = data["Close"], data["Volume"]
+    if isinstance(closes, pd.Series):
+        closes, volumes = closes.to_frame(tickers[0]), volumes.to_frame(tickers[0])
+    index = db.to_local_naive(closes.index)
+
+    latest, _ = db.get_backfill_marks(tickers)
+    rows = []
+    for t in tickers:
+        if t not in closes.columns: continue
+        frame = pd.DataFrame({"price": closes[t].to_numpy(), "volume": volumes[t].to_numpy()}, index=index).dropna()
+        frame = frame.iloc[-bars:]
+        if latest.get(t):
+            frame = frame[frame.index > pd.to_datetime(latest[t])]
+        rows.extend((t, ts.to_pydatetime(), float(p), int(v)) for ts, p, v in frame.itertuples())
+
+    if not rows: return 0
+    last = {t: (p, v) for t, _, p, v in rows}    # Rows are in time order per ticker
+    conn = db.get_connection()
+    with conn:
+        db.insert_market_bars(conn, rows)
+        for t, (price, volume) in last.items():
+            _, z = bk.detect_anomalies(t, volume, conn=conn)
+            db.update_ticker_state(conn, t, price=price, volume=volume, z=z, summarize=bk.generate_ai_summary)
+    conn.close()
+    return len(rows)
+
+def backfill_news(terms):
+    """
+    Fetches headlines for {ticker: search_term} concurrently and bulk-inserts unseen ones,
+    folding them into each ticker's dashboard sentiment in the same transaction.
+    """
+    tickers = list(terms)
+    with ThreadPoolExecutor(max_workers=NEWS_WORKERS) as pool:
+        results = list(pool.map(bk.fetch_news_articles, [terms[t] for t in tickers]))
+
+    _, seen = db.get_backfill_marks(tickers)
+    ts = datetime.now()
+    rows = []
+    for t, articles in zip(tickers, results):
+        stored = seen.get(t, set())
+        for a in articles:
+            if a["title"] in stored: continue
+            stored.add(a["title"])
+            rows.append((t, a["source"], a["title"], a["sentiment"], ts))
+
+    conn = db.get_connection()
+    with conn:
+        db.insert_sentiment(conn, rows)
+        for t, articles in zip(tickers, results):
+            if articles:
+                avg = float(np.mean([a["sentiment"] for a in articles]))
+                db.update_ticker_state(conn, t, sentiment=avg, summarize=bk.generate_ai_summary)
+    conn.close()
+    return len(rows)
+
+def backfill(terms, period="1d", bars=DEFAULT_BARS, news=True):
+    """Warms the anomaly window and sentiment baseline for {ticker: search_term}."""
+    start = time.perf_counter()
+    n_prices = backfill_prices(list(terms), period=period, bars=bars)
+    n_news = backfill_news(terms) if news else 0
+    elapsed = time.perf_counter() - start
+    return f"Backfilled {len(terms)} tickers: {n_prices} bars, {n_news} headlines in {elapsed:.1f}s"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk historical backfill for tracked or new tickers")
+    parser.add_argument("tickers", nargs="*", help="Tickers to backfill (e.g. RELIANCE.NS)")
+    parser.add_argument("--file", help="Watchlist file (one ticker per line) or NSE constituents CSV")
+    parser.add_argument("--tracked", action="store_true", help="Backfill every tracked stock")
+    parser.add_argument("--track", action="store_true", help="Also start tracking tickers that are not tracked yet")
+    parser.add_argument("--period", default="1d", help="yfinance period for minute bars (max 7d)")
+    parser.add_argument("--bars", type=int, default=DEFAULT_BARS, help="Minute bars to keep per ticker")
+    parser.add_argument("--no-news", action="store_true", help="Skip the news sentiment baseline")
+    args = parser.parse_args()
+
+    db.init_db()
+    tracked = {s['ticker']: s['search_term'] for s in db.get_tracked_stocks()}
+    requested = [t.upper() for t in args.tickers]
+    if args.file:
+        if not os.path.exists(args.file):
+            parser.error(f"Watchlist file not found: {args.file}")
+        requested += load_universe(args.file)
+
+    terms = dict(tracked) if args.tracked else {}
+    for t in requested:
+        terms.setdefault(t, tracked.get(t) or default_term(t))
+    if not terms:
+        parser.error("No tickers given (pass tickers, --file or --tracked)")
+
+    if args.track:
+        db.add_stocks([(t, term) for t, term in terms.items() if t not in tracked])
+    print(backfill(terms, period=args.period, bars=args.bars, news=not args.no_news))
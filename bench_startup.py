@@ -0,0 +1,59 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Modules the dashboard imports on every cold start
+MODULES = ["database", "backend"]
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def time_import(module, runs=5):
+    """Median wall time (ms) of importing `module` in a fresh interpreter."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    baseline = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        baseline.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples) - statistics.median(baseline)
+
+def top_imports(module, limit=10):
+    """Slowest cumulative imports for `module`, from `python -X importtime`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line: continue
+        _, cumulative_us, name = line.split("|", 2)
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+def time_init_db(runs=5):
+    """Median time (ms) of db.init_db() on an existing database, i.e. the old per-rerun cost."""
+    import database as db
+    db.DB_FILE = os.path.join(tempfile.mkdtemp(), "bench.db")
+    db.init_db()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        db.init_db()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time and initialization benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in MODULES:
+        print(f"import {module}: {time_import(module, args.runs):.1f} ms")
+        for cumulative_us, name in top_imports(module):
+            print(f"    {cumulative_us / 1000:8.1f} ms  {name}")
+    print(f"db.init_db() (warm): {time_init_db(args.runs):.2f} ms")
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Chart data stage: keeps the Plotly payload proportional to the viewport, not the date range.
+CHART_WIDTH_PX = 800        # Approximate plot width of the Overview column
+PX_PER_CANDLE = 3           # Narrower candles are unreadable anyway
+PRICE_DECIMALS = 2
+SMA_WINDOWS = [(21, "yellow"), (50, "orange"), (200, "red")]
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling. Returns the indices of the kept points
+    (always including the first and last), preserving the visual shape of the line.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        nxt_lo, nxt_hi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x = x[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+def aggregate_ohlc(df, buckets):
+    """Merges consecutive bars into `buckets` OHLC bars (first open, max high, min low, last close)."""
+    n = len(df)
+    if n <= buckets:
+        return df
+
+    ids = np.arange(n) * buckets // n
+    starts = np.flatnonzero(np.diff(ids, prepend=-1))
+    ends = np.append(starts[1:], n) - 1
+    out = pd.DataFrame({
+        "Open": df["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+        "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+        "Close": df["Close"].to_numpy()[ends],
+    }, index=df.index[starts])
+    if "Volume" in df:
+        out["Volume"] = np.add.reduceat(df["Volume"].to_numpy(), starts)
+    return out
+
+def downsample_line(series, points):
+    """LTTB-downsamples a time series (NaNs dropped) to at most `points` points."""
+    series = series.dropna()
+    if len(series) <= points:
+        return series
+    index = series.index
+    x = index.asi8 if hasattr(index, "asi8") else np.arange(len(series))
+    return series.iloc[lttb(x, series.to_numpy(), points)]
+
+def prepare_chart_data(hist_df, width_px=CHART_WIDTH_PX):
+    """
+    Returns (candles, overlays): OHLC bucketed to the pixel budget and
+    {window: SMA series} computed on the full data, then LTTB-downsampled.
+    """
+    overlays = {}
+    for window, _ in SMA_WINDOWS:
+        if len(hist_df) > window:
+            sma = hist_df["Close"].rolling(window=window).mean()
+            overlays[window] = downsample_line(sma, width_px).round(PRICE_DECIMALS)
+
+    candles = aggregate_ohlc(hist_df, max(width_px // PX_PER_CANDLE, 1))
+    candles = candles[["Open", "High", "Low", "Close"]].round(PRICE_DECIMALS)
+    return candles, overlays
+
+def build_price_figure(hist_df, title, width_px=CHART_WIDTH_PX):
+    """Candlestick + SMA overlays whose size stays constant regardless of the timeframe."""
+    candles, overlays = prepare_chart_data(hist_df, width_px)
+    colors = dict(SMA_WINDOWS)
+
+    fig = go.Figure()
+    fig.add_trace(go.Candlestick(x=candles.index, open=candles['Open'], high=candles['High'], low=candles['Low'], close=candles['Close'], name='Price'))
+    for window, sma in overlays.items():
+        fig.add_trace(go.Scattergl(x=sma.index, y=sma.to_numpy(), mode='lines', name=f'SMA {window}', line=dict(color=colors[window], width=1)))
+    fig.update_layout(title=title, yaxis_title="Price", xaxis_rangeslider_visible=False, template="plotly_dark", height=400)
+    return fig
@@ -0,0 +1,92 @@
+import threading
+import time
+import database as db
+
+# Circuit breakers for flaky upstreams. While a circuit is open, callers skip the
+# network entirely and return their empty/negative result straight away.
+
+CLOSED, OPEN, HALF_OPEN, DISABLED = "closed", "open", "half-open", "disabled"
+
+FAILURE_THRESHOLD = 3       # Consecutive failures before the circuit opens
+BASE_BACKOFF = 30           # Seconds the circuit stays open the first time
+MAX_BACKOFF = 6 * 3600      # Backoff doubles on every failed probe, up to this
+STATE_REFRESH = 3600        # A disabled circuit re-stamps its stored row this often so it doesn't expire
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open single probe -> closed or open again."""
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, base_backoff=BASE_BACKOFF, max_backoff=MAX_BACKOFF):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = CLOSED
+        self.failures = 0
+        self.backoff = base_backoff
+        self.opened_until = 0.0
+        self.last_error = None
+        self.persisted_at = 0.0
+        # A row left open/disabled by an earlier process must be cleared on the first success here
+        self.stale_row = _stored_state(name) not in (None, CLOSED)
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True if a call may go out. An expired open circuit lets exactly one probe through."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() >= self.opened_until:
+                self._set(HALF_OPEN)
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.backoff = self.base_backoff
+            if self.state != CLOSED or self.stale_row:
+                self.last_error = None
+                self._set(CLOSED)
+
+    def record_failure(self, error):
+        with self._lock:
+            if self.state == DISABLED: return
+            self.failures += 1
+            self.last_error = str(error)[:200]
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_until = time.time() + self.backoff
+                self.backoff = min(self.max_backoff, self.backoff * 2)
+                self._set(OPEN)
+
+    def disable(self, reason):
+        """Permanently opens the circuit (e.g. missing credentials) until the process restarts."""
+        with self._lock:
+            if self.state != DISABLED or time.time() - self.persisted_at > STATE_REFRESH:
+                self.last_error = reason
+                self._set(DISABLED)
+
+    def _set(self, state):
+        self.state = state
+        try:
+            db.save_circuit_state(self.name, state, self.failures, self.opened_until, self.last_error)
+            self.persisted_at = time.time()
+            self.stale_row = False
+        except Exception as e:
+            print(f"Could not persist circuit {self.name}: {e}")
+
+def _stored_state(name):
+    try:
+        return db.get_circuit_state(name)
+    except Exception:
+        return None
+
+_breakers = {}
+_registry_lock = threading.Lock()
+
+def get_breaker(source, key=None):
+    """Shared breaker per source (e.g. 'valuepickr') or per source + ticker (e.g. 'yfinance:TCS.NS')."""
+    name = f"{source}:{key}" if key else source
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
@@ -1,15 +1,27 @@
+import json
 import sqlite3
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+import alert_bus
 
 DB_FILE = "sentinel_data.db"
 
+SENTIMENT_HALF_LIFE = 2 * 3600     # Seconds for a stored headline to lose half its weight in the materialized sentiment
+SENTIMENT_WINDOW = 5 * SENTIMENT_HALF_LIFE
+RECENT_ALERTS_KEPT = 5
+SOURCE_HEALTH_TTL = 12 * 3600      # Seconds before an untouched, long-expired circuit row is dropped
+
 def get_connection():
     return sqlite3.connect(DB_FILE, check_same_thread=False)
 
 def init_db():
     conn = get_connection()
     c = conn.cursor()
+
+    # WAL lets several ingestion workers and the dashboard read while one writes
+    c.execute("PRAGMA journal_mode=WAL")
     
     # 1. Tracked Stocks (Updated Schema for Custom Alerts)
     # We use ALTER TABLE to add columns if they don't exist (for existing DBs)
@@ -20,12 +32,12 @@ def init_db():
                     anomaly_thresh REAL DEFAULT 3.0
                 )''')
     
-    # Migration for existing DBs (Safe to run every time)
-    try:
+    # Migration for existing DBs: only add the columns that are actually missing
+    columns = {row[1] for row in c.execute("PRAGMA table_info(tracked_stocks)")}
+    if "sentiment_thresh" not in columns:
         c.execute("ALTER TABLE tracked_stocks ADD COLUMN sentiment_thresh REAL DEFAULT 0.2")
+    if "anomaly_thresh" not in columns:
         c.execute("ALTER TABLE tracked_stocks ADD COLUMN anomaly_thresh REAL DEFAULT 3.0")
-    except sqlite3.OperationalError:
-        pass # Columns already exist
 
     # ... (Keep other tables same) ...
     c.execute('''CREATE TABLE IF NOT EXISTS market_data (
@@ -52,6 +64,103 @@ def init_db():
                     message TEXT,
                     timestamp DATETIME
                 )''')
+
+    # Per-ticker id order serves the dashboard's "latest N" reads and keyset-paginated exports
+    c.execute("CREATE INDEX IF NOT EXISTS idx_market_data_ticker ON market_data (ticker, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_data_ticker ON sentiment_data (ticker, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_alerts_ticker ON alerts (ticker, id)")
+
+    # Peer discovery: cached daily closes, sector/industry profiles and ranked peers
+    c.execute('''CREATE TABLE IF NOT EXISTS daily_bars (
+                    ticker TEXT,
+                    date TEXT,
+                    close REAL,
+                    PRIMARY KEY (ticker, date)
+                )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS ticker_profile (
+                    ticker TEXT PRIMARY KEY,
+                    sector TEXT,
+                    industry TEXT,
+                    updated DATETIME
+                )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS peer_map (
+                    ticker TEXT,
+                    rank INTEGER,
+                    peer TEXT,
+                    correlation REAL,
+                    updated DATETIME,
+                    PRIMARY KEY (ticker, rank)
+                )''')
+
+    # When each ticker was last covered by a peer refresh, mapped or not (so misses aren't retried every tick)
+    c.execute('''CREATE TABLE IF NOT EXISTS peer_attempts (
+                    ticker TEXT PRIMARY KEY,
+                    attempted DATETIME
+                )''')
+
+    # Materialized per-ticker dashboard state, maintained by the pipeline's write transactions
+    c.execute('''CREATE TABLE IF NOT EXISTS ticker_state (
+                    ticker TEXT PRIMARY KEY,
+                    last_price REAL,
+                    last_volume INTEGER,
+                    current_z REAL,
+                    sentiment REAL,
+                    ai_summary TEXT,
+                    alert_count INTEGER DEFAULT 0,
+                    recent_alerts TEXT,
+                    last_alert_at DATETIME,
+                    price_updated_at DATETIME,
+                    news_updated_at DATETIME,
+                    updated_at DATETIME
+                )''')
+
+    # Reddit ingestion: stored posts (one row per post and matched ticker) and per-ticker cursors
+    c.execute('''CREATE TABLE IF NOT EXISTS reddit_posts (
+                    id TEXT,
+                    ticker TEXT,
+                    subreddit TEXT,
+                    title TEXT,
+                    url TEXT,
+                    score INTEGER,
+                    num_comments INTEGER,
+                    sentiment REAL,
+                    created_utc REAL,
+                    fetched_at DATETIME,
+                    PRIMARY KEY (id, ticker)
+                )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_reddit_posts_ticker ON reddit_posts (ticker, created_utc)")
+
+    c.execute('''CREATE TABLE IF NOT EXISTS reddit_cursors (
+                    ticker TEXT PRIMARY KEY,
+                    last_created_utc REAL
+                )''')
+
+    # Circuit breaker state per data source (and per ticker), for the dashboard
+    c.execute('''CREATE TABLE IF NOT EXISTS source_health (
+                    name TEXT PRIMARY KEY,
+                    state TEXT,
+                    failures INTEGER,
+                    retry_at REAL,
+                    last_error TEXT,
+                    updated DATETIME
+                )''')
+
+    # Ingestion workers: heartbeats and time-limited shard leases (times are unix seconds)
+    c.execute('''CREATE TABLE IF NOT EXISTS workers (
+                    worker_id TEXT PRIMARY KEY,
+                    heartbeat REAL
+                )''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS shard_leases (
+                    shard INTEGER PRIMARY KEY,
+                    worker_id TEXT,
+                    expires_at REAL
+                )''')
+
+    # Circuit rows left by processes that are gone
+    expire_circuit_states(conn)
     
     conn.commit()
     conn.close()
@@ -85,9 +194,19 @@ def get_tracked_stocks():
     conn.close()
     return df.to_dict('records')
 
+def add_stocks(rows):
+    """Bulk-tracks (ticker, search_term) rows, keeping thresholds of stocks already tracked."""
+    conn = get_connection()
+    conn.executemany("INSERT OR IGNORE INTO tracked_stocks (ticker, search_term) VALUES (?, ?)",
+                     [(t.upper(), term) for t, term in rows])
+    conn.commit()
+    conn.close()
+
 def remove_stock(ticker):
     conn = get_connection()
     conn.execute("DELETE FROM tracked_stocks WHERE ticker = ?", (ticker,))
+    # Per-ticker circuits are named '<source>:<ticker>'
+    conn.execute("DELETE FROM source_health WHERE instr(name, ':') > 0 AND substr(name, instr(name, ':') + 1) = ?", (ticker,))
     conn.commit()
     conn.close()
 
@@ -100,6 +219,11 @@ def log_market_data(ticker, price, volume):
     conn.commit()
     conn.close()
 
+def insert_market_data(conn, ticker, price, volume):
+    """Inserts a live tick on an open transaction (see backend.process_market)."""
+    conn.execute("INSERT INTO market_data (ticker, timestamp, price, volume) VALUES (?, ?, ?, ?)", 
+                 (ticker, datetime.now(), price, volume))
+
 def log_sentiment(ticker, source, content, score):
     conn = get_connection()
     ts = datetime.now()
@@ -108,13 +232,110 @@ def log_sentiment(ticker, source, content, score):
     conn.commit()
     conn.close()
 
+def to_local_naive(ts):
+    """Converts exchange timestamps (a Timestamp or DatetimeIndex) to the naive local time every row is stored in."""
+    if getattr(ts, "tz", None) is not None:
+        ts = ts.tz_convert(datetime.now().astimezone().tzinfo).tz_localize(None)
+    return ts
+
+def save_price(ticker, ts, price, volume):
+    """Stores a price bar with its own (exchange) timestamp."""
+    bulk_insert_market_data([(ticker, to_local_naive(pd.Timestamp(ts)).to_pydatetime(), price, volume)])
+
+def bulk_insert_market_data(rows):
+    """Inserts (ticker, timestamp, price, volume) rows in a single transaction."""
+    if not rows: return
+    conn = get_connection()
+    with conn:
+        insert_market_bars(conn, rows)
+    conn.close()
+
+def insert_market_bars(conn, rows):
+    """Inserts (ticker, timestamp, price, volume) rows on an open transaction."""
+    conn.executemany("INSERT INTO market_data (ticker, timestamp, price, volume) VALUES (?, ?, ?, ?)", rows)
+
+def bulk_insert_sentiment(rows):
+    """Inserts (ticker, source, content, score, timestamp) rows in a single transaction."""
+    if not rows: return
+    conn = get_connection()
+    with conn:
+        insert_sentiment(conn, rows)
+    conn.close()
+
+def insert_sentiment(conn, rows):
+    """Inserts (ticker, source, content, score, timestamp) rows on an open transaction."""
+    conn.executemany("INSERT INTO sentiment_data (ticker, source, content, sentiment_score, timestamp) VALUES (?, ?, ?, ?, ?)", 
+                     rows)
+
+def get_recent_prices(ticker, limit=20):
+    """Returns the newest (timestamp, price, volume) rows for a ticker."""
+    conn = get_connection()
+    rows = conn.execute("SELECT timestamp, price, volume FROM market_data WHERE ticker = ? ORDER BY id DESC LIMIT ?", 
+                        (ticker, limit)).fetchall()
+    conn.close()
+    return rows
+
+def get_recent_headlines(ticker, limit=200):
+    """Set of the newest stored headlines for a ticker, used to skip re-logging the same news."""
+    conn = get_connection()
+    rows = conn.execute("SELECT content FROM sentiment_data WHERE ticker = ? ORDER BY id DESC LIMIT ?", (ticker, limit)).fetchall()
+    conn.close()
+    return {r[0] for r in rows}
+
+def get_backfill_marks(tickers):
+    """Returns ({ticker: latest market timestamp}, {ticker: set of stored headlines}) for de-duplication."""
+    conn = get_connection()
+    placeholders = ",".join("?" * len(tickers))
+    latest = dict(conn.execute(f"SELECT ticker, MAX(timestamp) FROM market_data WHERE ticker IN ({placeholders}) GROUP BY ticker", 
+                               list(tickers)).fetchall())
+    seen = {}
+    for t, content in conn.execute(f"SELECT ticker, content FROM sentiment_data WHERE ticker IN ({placeholders})", list(tickers)):
+        seen.setdefault(t, set()).add(content)
+    conn.close()
+    return latest, seen
+
 def log_alert(ticker, alert_type, message):
+    log_alerts([(ticker, alert_type, message)])
+
+def log_alerts(rows):
+    """Inserts (ticker, alert_type, message) rows in a single transaction, then publishes them."""
+    if not rows: return
     conn = get_connection()
+    by_ticker = {}
+    with conn:
+        for t, a_type, msg in rows:
+            by_ticker.setdefault(t, []).append(insert_alert(conn, t, a_type, msg))
+        for t, alerts in by_ticker.items():
+            update_ticker_state(conn, t, alerts=alerts)
+    conn.close()
+    publish_alerts([a for alerts in by_ticker.values() for a in alerts])
+
+def insert_alert(conn, ticker, alert_type, message):
+    """Inserts an alert on an open transaction. Returns it as the dict published on the bus."""
     ts = datetime.now()
-    conn.execute("INSERT INTO alerts (ticker, alert_type, message, timestamp) VALUES (?, ?, ?, ?)", 
-                 (ticker, alert_type, message, ts))
-    conn.commit()
+    cur = conn.execute("INSERT INTO alerts (ticker, alert_type, message, timestamp) VALUES (?, ?, ?, ?)", 
+                       (ticker, alert_type, message, ts))
+    return {"id": cur.lastrowid, "ticker": ticker, "alert_type": alert_type, 
+            "message": message, "timestamp": ts.isoformat(sep=" ")}
+
+def publish_alerts(alerts):
+    # Publish only after commit so subscribers never see an alert that was rolled back
+    for alert in alerts:
+        alert_bus.publish(alert)
+
+def get_last_alert_id():
+    conn = get_connection()
+    last = conn.execute("SELECT MAX(id) FROM alerts").fetchone()[0]
     conn.close()
+    return last or 0
+
+def fetch_alerts_after(last_id, limit=1000):
+    """Alerts with id > last_id in id order, as the dicts published on the bus."""
+    conn = get_connection()
+    rows = conn.execute("SELECT id, ticker, alert_type, message, timestamp FROM alerts WHERE id > ? ORDER BY id LIMIT ?",
+                        (last_id, limit)).fetchall()
+    conn.close()
+    return [{"id": i, "ticker": t, "alert_type": a_type, "message": msg, "timestamp": ts} for i, t, a_type, msg, ts in rows]
 
 def fetch_recent_alerts(limit=10):
     conn = get_connection()
@@ -126,4 +347,289 @@ def fetch_chart_data(ticker, limit=50):
     conn = get_connection()
     df = pd.read_sql(f"SELECT timestamp, price FROM market_data WHERE ticker='{ticker}' ORDER BY id DESC LIMIT {limit}", conn)
     conn.close()
-    return df
\ No newline at end of file
+    return df
+
+# --- Ticker State ---
+
+TICKER_STATE_COLUMNS = ["ticker", "last_price", "last_volume", "current_z", "sentiment", "ai_summary", "alert_count",
+                        "recent_alerts", "last_alert_at", "price_updated_at", "news_updated_at", "updated_at"]
+
+def decayed_sentiment(conn, ticker, now):
+    """Age-weighted mean score of the ticker's headlines from the last SENTIMENT_WINDOW (None if there are none)."""
+    rows = conn.execute("SELECT sentiment_score, timestamp FROM sentiment_data WHERE ticker = ? AND timestamp >= ?",
+                        (ticker, now - timedelta(seconds=SENTIMENT_WINDOW))).fetchall()
+    if not rows: return None
+    scores = np.array([r[0] for r in rows], dtype=float)
+    ages = (now - pd.to_datetime([r[1] for r in rows])).total_seconds().to_numpy()
+    weights = 0.5 ** (np.maximum(ages, 0) / SENTIMENT_HALF_LIFE)
+    return float(np.average(scores, weights=weights))
+
+def update_ticker_state(conn, ticker, price=None, volume=None, z=None, sentiment=None, alerts=(), summarize=None):
+    """
+    Folds one pipeline result into the ticker's ticker_state row, on the caller's open transaction.
+    On news, sentiment becomes the mean of the stored headlines, each weighted by its own age
+    (halving every SENTIMENT_HALF_LIFE); `sentiment` is used only if none are stored.
+    `summarize(sentiment, z)` refreshes the AI brief whenever either input changes.
+    """
+    now = datetime.now()
+    row = conn.execute(f"SELECT {', '.join(TICKER_STATE_COLUMNS)} FROM ticker_state WHERE ticker = ?", (ticker,)).fetchone()
+    state = dict(zip(TICKER_STATE_COLUMNS, row)) if row else {"ticker": ticker, "alert_count": 0, "current_z": 0.0, "sentiment": 0.0}
+
+    if price is not None:
+        state.update(last_price=price, last_volume=volume, current_z=z or 0.0, price_updated_at=now)
+    if sentiment is not None:
+        decayed = decayed_sentiment(conn, ticker, now)
+        state.update(sentiment=float(sentiment if decayed is None else decayed), news_updated_at=now)
+    if alerts:
+        recent = alerts[::-1] + json.loads(state.get("recent_alerts") or "[]")
+        state.update(alert_count=(state.get("alert_count") or 0) + len(alerts), last_alert_at=now,
+                     recent_alerts=json.dumps(recent[:RECENT_ALERTS_KEPT]))
+    if summarize and (price is not None or sentiment is not None):
+        state["ai_summary"] = summarize(state.get("sentiment") or 0.0, state.get("current_z") or 0.0)
+    state["updated_at"] = now
+
+    values = [state.get(c) for c in TICKER_STATE_COLUMNS]
+    conn.execute(f"INSERT OR REPLACE INTO ticker_state ({', '.join(TICKER_STATE_COLUMNS)}) VALUES ({', '.join('?' * len(values))})", 
+                 values)
+
+def fetch_ticker_states(tickers):
+    """All dashboard state for `tickers` in one primary-key read: {ticker: state dict}."""
+    if not tickers: return {}
+    conn = get_connection()
+    placeholders = ",".join("?" * len(tickers))
+    rows = conn.execute(f"SELECT {', '.join(TICKER_STATE_COLUMNS)} FROM ticker_state WHERE ticker IN ({placeholders})", 
+                        list(tickers)).fetchall()
+    conn.close()
+    states = {}
+    for row in rows:
+        state = dict(zip(TICKER_STATE_COLUMNS, row))
+        state["recent_alerts"] = json.loads(state["recent_alerts"] or "[]")
+        states[state["ticker"]] = state
+    return states
+
+# --- Reddit Posts ---
+
+def get_reddit_cursors(tickers):
+    """Returns {ticker: created_utc of the newest post already ingested}."""
+    conn = get_connection()
+    placeholders = ",".join("?" * len(tickers))
+    rows = conn.execute(f"SELECT ticker, last_created_utc FROM reddit_cursors WHERE ticker IN ({placeholders})", 
+                        list(tickers)).fetchall()
+    conn.close()
+    return dict(rows)
+
+def save_reddit_posts(rows, cursors):
+    """
+    Upserts (id, ticker, subreddit, title, url, score, num_comments, sentiment, created_utc) rows
+    and advances the {ticker: created_utc} cursors in the same transaction.
+    """
+    conn = get_connection()
+    ts = datetime.now()
+    with conn:
+        conn.executemany("""
+            INSERT INTO reddit_posts (id, ticker, subreddit, title, url, score, num_comments, sentiment, created_utc, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id, ticker) DO UPDATE SET score = excluded.score, num_comments = excluded.num_comments, fetched_at = excluded.fetched_at
+        """, [row + (ts,) for row in rows])
+        conn.executemany("""
+            INSERT INTO reddit_cursors (ticker, last_created_utc) VALUES (?, ?)
+            ON CONFLICT (ticker) DO UPDATE SET last_created_utc = MAX(last_created_utc, excluded.last_created_utc)
+        """, list(cursors.items()))
+    conn.close()
+
+def get_recent_reddit_posts(tickers, since):
+    """Stored post rows (in save_reddit_posts order) created after the unix time `since`."""
+    conn = get_connection()
+    placeholders = ",".join("?" * len(tickers))
+    rows = conn.execute(f"""
+        SELECT id, ticker, subreddit, title, url, score, num_comments, sentiment, created_utc FROM reddit_posts
+        WHERE ticker IN ({placeholders}) AND created_utc > ?
+    """, list(tickers) + [since]).fetchall()
+    conn.close()
+    return rows
+
+def fetch_reddit_posts(ticker, limit=15):
+    """Stored posts for a ticker, newest first, in the shape the Social tab renders."""
+    conn = get_connection()
+    rows = conn.execute("""
+        SELECT subreddit, title, url, sentiment, score, num_comments FROM reddit_posts 
+        WHERE ticker = ? ORDER BY created_utc DESC LIMIT ?
+    """, (ticker, limit)).fetchall()
+    conn.close()
+    return [{"source": f"r/{sub}", "title": title, "url": url, "sentiment": sent, "score": score, "comments": comments}
+            for sub, title, url, sent, score, comments in rows]
+
+# --- Peer Discovery ---
+
+def save_daily_closes(rows):
+    """Upserts (ticker, date, close) rows in a single transaction."""
+    conn = get_connection()
+    conn.executemany("INSERT OR REPLACE INTO daily_bars (ticker, date, close) VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+def get_daily_marks(tickers):
+    """Returns {ticker: latest cached daily bar date ('YYYY-MM-DD')}."""
+    conn = get_connection()
+    placeholders = ",".join("?" * len(tickers))
+    rows = conn.execute(f"SELECT ticker, MAX(date) FROM daily_bars WHERE ticker IN ({placeholders}) GROUP BY ticker",
+                        list(tickers)).fetchall()
+    conn.close()
+    return dict(rows)
+
+def load_daily_closes(tickers, since):
+    """Returns cached daily closes as a dates x tickers DataFrame (NaN where a ticker has no bar)."""
+    conn = get_connection()
+    placeholders = ",".join("?" * len(tickers))
+    df = pd.read_sql(f"SELECT ticker, date, close FROM daily_bars WHERE date >= ? AND ticker IN ({placeholders})",
+                     conn, params=[since] + list(tickers))
+    conn.close()
+    if df.empty:
+        return pd.DataFrame()
+    return df.pivot(index="date", columns="ticker", values="close").sort_index()
+
+def save_ticker_profiles(rows):
+    """Upserts (ticker, sector, industry) rows."""
+    conn = get_connection()
+    ts = datetime.now()
+    conn.executemany("INSERT OR REPLACE INTO ticker_profile (ticker, sector, industry, updated) VALUES (?, ?, ?, ?)",
+                     [(t, sector, industry, ts) for t, sector, industry in rows])
+    conn.commit()
+    conn.close()
+
+def get_ticker_profiles():
+    """
+    Returns {ticker: {'sector': ..., 'industry': ..., 'updated': ...}} for every profiled ticker.
+    Failed lookups are stored with a None sector and industry.
+    """
+    conn = get_connection()
+    rows = conn.execute("SELECT ticker, sector, industry, updated FROM ticker_profile").fetchall()
+    conn.close()
+    return {t: {"sector": sector, "industry": industry, "updated": pd.to_datetime(updated)} for t, sector, industry, updated in rows}
+
+def replace_peer_map(rows):
+    """Atomically replaces the peer map with (ticker, rank, peer, correlation) rows."""
+    conn = get_connection()
+    ts = datetime.now()
+    with conn:
+        conn.execute("DELETE FROM peer_map")
+        conn.executemany("INSERT INTO peer_map (ticker, rank, peer, correlation, updated) VALUES (?, ?, ?, ?, ?)",
+                         [(t, rank, peer, corr, ts) for t, rank, peer, corr in rows])
+    conn.close()
+
+def get_peers(ticker, limit=3):
+    conn = get_connection()
+    rows = conn.execute("SELECT peer FROM peer_map WHERE ticker = ? ORDER BY rank LIMIT ?", (ticker, limit)).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+def mark_peer_attempts(tickers):
+    """Records that a peer refresh covered `tickers`, whether or not they got peers."""
+    conn = get_connection()
+    ts = datetime.now()
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO peer_attempts (ticker, attempted) VALUES (?, ?)", [(t, ts) for t in tickers])
+    conn.close()
+
+def get_peer_map_status():
+    """Returns (last refresh attempt or None, set of tickers that have peers, {ticker: last attempt})."""
+    conn = get_connection()
+    attempts = {t: pd.to_datetime(ts) for t, ts in conn.execute("SELECT ticker, attempted FROM peer_attempts").fetchall()}
+    mapped = {r[0] for r in conn.execute("SELECT DISTINCT ticker FROM peer_map").fetchall()}
+    conn.close()
+    return (max(attempts.values()) if attempts else None), mapped, attempts
+
+# --- Worker Shard Leases ---
+
+def ensure_shards(num_shards):
+    conn = get_connection()
+    conn.executemany("INSERT OR IGNORE INTO shard_leases (shard, worker_id, expires_at) VALUES (?, NULL, 0)",
+                     [(i,) for i in range(num_shards)])
+    conn.commit()
+    conn.close()
+
+def heartbeat_worker(worker_id, now):
+    conn = get_connection()
+    conn.execute("INSERT OR REPLACE INTO workers (worker_id, heartbeat) VALUES (?, ?)", (worker_id, now))
+    conn.commit()
+    conn.close()
+
+def get_live_workers(since):
+    """Returns worker ids (sorted) whose last heartbeat is newer than `since`."""
+    conn = get_connection()
+    rows = conn.execute("SELECT worker_id FROM workers WHERE heartbeat >= ? ORDER BY worker_id", (since,)).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+def remove_worker(worker_id):
+    conn = get_connection()
+    conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+    conn.execute("UPDATE shard_leases SET worker_id = NULL, expires_at = 0 WHERE worker_id = ?", (worker_id,))
+    conn.commit()
+    conn.close()
+
+def renew_shards(worker_id, expires_at):
+    """Extends every lease this worker still holds. Returns the owned shard ids."""
+    conn = get_connection()
+    conn.execute("UPDATE shard_leases SET expires_at = ? WHERE worker_id = ?", (expires_at, worker_id))
+    conn.commit()
+    rows = conn.execute("SELECT shard FROM shard_leases WHERE worker_id = ? ORDER BY shard", (worker_id,)).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+def claim_shards(worker_id, count, now, expires_at):
+    """Atomically takes up to `count` free or expired shards (a single UPDATE, so claims never overlap)."""
+    if count <= 0: return
+    conn = get_connection()
+    conn.execute("""
+        UPDATE shard_leases SET worker_id = ?, expires_at = ?
+        WHERE shard IN (SELECT shard FROM shard_leases 
+                        WHERE worker_id IS NULL OR expires_at < ? 
+                        ORDER BY shard LIMIT ?)
+    """, (worker_id, expires_at, now, count))
+    conn.commit()
+    conn.close()
+
+def release_shards(worker_id, shards):
+    conn = get_connection()
+    conn.executemany("UPDATE shard_leases SET worker_id = NULL, expires_at = 0 WHERE shard = ? AND worker_id = ?",
+                     [(s, worker_id) for s in shards])
+    conn.commit()
+    conn.close()
+
+# --- Source Health ---
+
+def save_circuit_state(name, state, failures, retry_at, last_error):
+    """Upserts one circuit's state and drops rows that dead processes left behind."""
+    conn = get_connection()
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO source_health (name, state, failures, retry_at, last_error, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                     (name, state, failures, retry_at, last_error, datetime.now()))
+        expire_circuit_states(conn)
+    conn.close()
+
+def expire_circuit_states(conn, max_age=SOURCE_HEALTH_TTL):
+    """Deletes rows untouched for `max_age` seconds whose retry time is also that far past, on an open transaction."""
+    cutoff = time.time() - max_age
+    conn.execute("DELETE FROM source_health WHERE updated < ? AND COALESCE(retry_at, 0) < ?",
+                 (datetime.fromtimestamp(cutoff), cutoff))
+
+def get_circuit_state(name):
+    conn = get_connection()
+    row = conn.execute("SELECT state FROM source_health WHERE name = ?", (name,)).fetchone()
+    conn.close()
+    return row[0] if row else None
+
+def fetch_unhealthy_sources(max_age=SOURCE_HEALTH_TTL):
+    """
+    Circuits that are not closed (open, half-open or disabled), most recent first. A plain read:
+    rows due to expire are hidden here and deleted on the write side (init_db, save_circuit_state).
+    """
+    cutoff = time.time() - max_age
+    conn = get_connection()
+    df = pd.read_sql("""
+        SELECT * FROM source_health WHERE state != 'closed' AND NOT (updated < ? AND COALESCE(retry_at, 0) < ?)
+        ORDER BY updated DESC
+    """, conn, params=(datetime.fromtimestamp(cutoff), cutoff))
+    conn.close()
+    return df
@@ -0,0 +1,198 @@
+import argparse
+import sqlite3
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pyarrow as pa
+import pyarrow.parquet as pq
+import database as db
+
+# Read-only columnar export of the stored data. Uses its own read-only SQLite
+# connections (WAL mode), so bulk reads never block the ingestion writers.
+
+EXPORT_SCHEMAS = {
+    "market_data": pa.schema([
+        ("id", pa.int64()), ("ticker", pa.string()), ("timestamp", pa.timestamp("us")),
+        ("price", pa.float64()), ("volume", pa.int64()),
+    ]),
+    "sentiment_data": pa.schema([
+        ("id", pa.int64()), ("ticker", pa.string()), ("source", pa.string()), ("content", pa.string()),
+        ("sentiment_score", pa.float64()), ("timestamp", pa.timestamp("us")),
+    ]),
+    "alerts": pa.schema([
+        ("id", pa.int64()), ("ticker", pa.string()), ("alert_type", pa.string()),
+        ("message", pa.string()), ("timestamp", pa.timestamp("us")),
+    ]),
+}
+BATCH_SIZE = 50_000
+PAGE_LIMIT = 1_000_000
+
+def get_readonly_connection():
+    conn = sqlite3.connect(f"file:{db.DB_FILE}?mode=ro", uri=True, check_same_thread=False)
+    conn.execute("PRAGMA query_only = 1")
+    return conn
+
+def build_query(table, columns, tickers=None, start=None, end=None, cursor=0):
+    """Keyset-paginated SELECT: rows with id > cursor matching the ticker/time filters, in id order."""
+    if table not in EXPORT_SCHEMAS:
+        raise ValueError(f"Unknown table '{table}' (expected one of {', '.join(EXPORT_SCHEMAS)})")
+    where, params = ["id > ?"], [cursor]
+    if tickers:
+        where.append(f"ticker IN ({','.join('?' * len(tickers))})")
+        params += list(tickers)
+    if start:
+        where.append("timestamp >= ?")
+        params.append(start)
+    if end:
+        where.append("timestamp < ?")
+        params.append(end)
+    return f"SELECT {', '.join(columns)} FROM {table} WHERE {' AND '.join(where)} ORDER BY id", params
+
+def parse_timestamps(values, type_):
+    """
+    ISO text -> Arrow timestamps. Naive local text takes one vectorized cast; blocks holding
+    other ISO forms (e.g. '2026-10-19T09:16:00+05:30') are parsed per value and converted to naive local time.
+    """
+    try:
+        return pa.array(values, pa.string()).cast(type_)
+    except pa.ArrowInvalid:
+        parsed = [datetime.fromisoformat(v) if v else None for v in values]
+        return pa.array([d.astimezone().replace(tzinfo=None) if d and d.tzinfo else d for d in parsed], type_)
+
+def to_record_batch(rows, schema):
+    """Converts a block of row tuples to one Arrow RecordBatch, column by column."""
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_timestamp(field.type):
+            arrays.append(parse_timestamps(values, field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def iter_batches(table, tickers=None, start=None, end=None, cursor=0, limit=None, batch_size=BATCH_SIZE):
+    """
+    Streams `table` as Arrow RecordBatches of up to `batch_size` rows, starting after id `cursor`
+    and stopping after `limit` rows. Resume a later page with the last id of the previous one.
+    """
+    schema = EXPORT_SCHEMAS.get(table)
+    sql, params = build_query(table, schema.names if schema else [], tickers, start, end, cursor)
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    conn = get_readonly_connection()
+    try:
+        cur = conn.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows: break
+            yield to_record_batch(rows, schema)
+    finally:
+        conn.close()
+
+def export_table(table, **filters):
+    """Reads one page into an Arrow Table. Returns (table, next_cursor or None when exhausted)."""
+    limit = filters.pop("limit", PAGE_LIMIT)
+    batches = list(iter_batches(table, limit=limit, **filters))
+    result = pa.Table.from_batches(batches, schema=EXPORT_SCHEMAS[table])
+    done = result.num_rows < limit
+    next_cursor = None if done or result.num_rows == 0 else result.column("id")[-1].as_py()
+    return result, next_cursor
+
+def page_end(table, tickers=None, start=None, end=None, cursor=0, limit=PAGE_LIMIT):
+    """Id of the last row of this page, or None if nothing follows it (cheap id-only probe)."""
+    sql, params = build_query(table, ["id"], tickers, start, end, cursor)
+    conn = get_readonly_connection()
+    rows = conn.execute(sql + f" LIMIT 2 OFFSET {int(limit) - 1}", params).fetchall()
+    conn.close()
+    return rows[0][0] if len(rows) == 2 else None
+
+def write_ipc(sink, table, **filters):
+    """Streams a page as Arrow IPC (stream format) into a file path or writable sink."""
+    with pa.ipc.new_stream(sink, EXPORT_SCHEMAS[table]) as writer:
+        for batch in iter_batches(table, **filters):
+            writer.write_batch(batch)
+
+def write_parquet(sink, table, **filters):
+    """Writes a page as Parquet, one row group per batch."""
+    with pq.ParquetWriter(sink, EXPORT_SCHEMAS[table]) as writer:
+        for batch in iter_batches(table, **filters):
+            writer.write_batch(batch)
+
+# --- HTTP SERVICE ---
+
+class ExportHandler(BaseHTTPRequestHandler):
+    """
+    GET /export/<table>?ticker=A,B&start=2026-01-01&end=2026-02-01&cursor=0&limit=100000&format=arrow|parquet
+    The next page's cursor comes back in the X-Next-Cursor header (absent on the last page).
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "export" or parts[1] not in EXPORT_SCHEMAS:
+            self.send_error(404, f"Use /export/<{'|'.join(EXPORT_SCHEMAS)}>")
+            return
+        table = parts[1]
+        query = parse_qs(url.query)
+        try:
+            filters = {
+                "tickers": [t.strip().upper() for v in query.get("ticker", []) for t in v.split(",") if t.strip()] or None,
+                "start": query.get("start", [None])[0],
+                "end": query.get("end", [None])[0],
+                "cursor": int(query.get("cursor", ["0"])[0]),
+                "limit": min(int(query.get("limit", [str(PAGE_LIMIT)])[0]), PAGE_LIMIT),
+            }
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        fmt = query.get("format", ["arrow"])[0]
+
+        next_cursor = page_end(table, **filters)
+        self.send_response(200)
+        if next_cursor is not None:
+            self.send_header("X-Next-Cursor", str(next_cursor))
+        if fmt == "parquet":
+            # Parquet needs the footer at the end, so the page is built in memory first
+            buf = pa.BufferOutputStream()
+            write_parquet(buf, table, **filters)
+            body = buf.getvalue()
+            self.send_header("Content-Type", "application/vnd.apache.parquet")
+            self.send_header("Content-Length", str(body.size))
+            self.end_headers()
+            self.wfile.write(memoryview(body))
+        else:
+            self.send_header("Content-Type", "application/vnd.apache.arrow.stream")
+            self.end_headers()
+            try:
+                write_ipc(pa.PythonFile(self.wfile, mode="w"), table, **filters)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(host="127.0.0.1", port=8503):
+    server = ThreadingHTTPServer((host, port), ExportHandler)
+    print(f"Export service on http://{host}:{port}/export/<table>")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only Arrow/Parquet export of Sentinel data")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_serve = sub.add_parser("serve", help="Run the HTTP export service")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8503)
+    p_dump = sub.add_parser("dump", help="Write one table to a .arrow or .parquet file")
+    p_dump.add_argument("table", choices=list(EXPORT_SCHEMAS))
+    p_dump.add_argument("out", help="Output path (.parquet for Parquet, anything else for Arrow IPC)")
+    p_dump.add_argument("--ticker", action="append", help="Repeatable ticker filter")
+    p_dump.add_argument("--start", help="Inclusive start timestamp (e.g. 2026-01-01)")
+    p_dump.add_argument("--end", help="Exclusive end timestamp")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.host, args.port)
+    else:
+        filters = {"tickers": args.ticker, "start": args.start, "end": args.end}
+        writer = write_parquet if args.out.endswith(".parquet") else write_ipc
+        writer(args.out, args.table, **filters)
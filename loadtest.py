@@ -0,0 +1,191 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+# Keep the harness off the real alert-stream port before app-side modules read their config
+os.environ.setdefault("SENTINEL_STREAM_PORT", "0")
+
+import numpy as np
+import pandas as pd
+import database as db
+import backend as bk
+import perf
+from universe import NIFTY_50
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+PERIOD_BARS = {"1d": 75, "5d": 125, "1mo": 22, "6mo": 125, "1y": 250, "5y": 1250}
+
+# --- STUBBED FETCHERS ---
+
+def install_stubs(latency=0.0):
+    """Replaces every network-bound backend fetcher with a deterministic fake that waits `latency` seconds."""
+    def wait():
+        if latency: time.sleep(latency)
+
+    def rng_for(ticker):
+        return np.random.default_rng(zlib.crc32(ticker.encode()))
+
+    def fetch_market_price(ticker):
+        wait()
+        return 100.0 + zlib.crc32(ticker.encode()) % 900, int(np.random.default_rng().integers(1_000, 50_000))
+
+    def fetch_historical_data(ticker, period="1mo"):
+        wait()
+        n = PERIOD_BARS.get(period, 125)
+        close = 100 + np.cumsum(rng_for(ticker).normal(0, 1, n))
+        index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=n, freq="D")
+        return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 10_000}, index=index)
+
+    def fetch_fundamentals(ticker):
+        wait()
+        return {
+            "longName": ticker, "summary": "Stubbed fundamentals.", "sector": "Technology", "industry": "IT Services",
+            "marketCap": 1.5e12, "trailingPE": 25.0, "forwardPE": 22.0, "pegRatio": 1.4, "bookValue": 320.0,
+            "trailingEps": 60.0, "dividendYield": 0.012, "returnOnEquity": 0.21, "returnOnAssets": 0.11,
+            "totalRevenue": 2.4e11, "debtToEquity": 35.0, "freeCashflow": 4.1e10, "totalCash": 6.0e10,
+            "fiftyTwoWeekHigh": 1800.0, "fiftyTwoWeekLow": 1200.0,
+        }
+
+    def fetch_analyst_data(ticker):
+        wait()
+        return {"targetHigh": 2000.0, "targetLow": 1300.0, "targetMean": 1700.0, "recommendation": "Buy", "numberOfAnalysts": 30}
+
+    def fetch_valuepickr_threads(search_term):
+        wait()
+        return [{"source": "ValuePickr Forum", "title": f"{search_term} thread {i}", "url": "https://forum.valuepickr.com/",
+                 "sentiment": 0.3, "snippet": "Active thread on ValuePickr..."} for i in range(3)]
+
+    def fetch_news_articles(search_term):
+        wait()
+        return [{"source": "Google News", "title": f"{search_term} posts record quarterly profit {i}", "sentiment": 0.5,
+                 "link": f"https://news.example/{search_term}/{i}"} for i in range(5)]
+
+    bk.fetch_market_price = fetch_market_price
+    bk.fetch_historical_data = fetch_historical_data
+    bk.fetch_fundamentals = fetch_fundamentals
+    bk.fetch_analyst_data = fetch_analyst_data
+    bk.fetch_valuepickr_threads = fetch_valuepickr_threads
+    bk.fetch_news_articles = fetch_news_articles
+    bk.fetch_daily_closes = lambda tickers, period=None: 0
+    bk.ingest_reddit = lambda stocks: {}
+
+def seed_database(n_stocks, ticks=25):
+    """Points the app at a throwaway DB with `n_stocks` tracked tickers and warm ticker state."""
+    db.DB_FILE = os.path.join(tempfile.mkdtemp(prefix="sentinel-load-"), "sentinel_data.db")
+    db.init_db()
+    db.add_stocks([(t, t.split('.')[0]) for t in NIFTY_50[:n_stocks]])
+    for stock in db.get_tracked_stocks():
+        for _ in range(ticks):
+            bk.process_market(stock)
+        bk.process_news(stock)
+
+# --- SESSIONS ---
+
+def run_session(db_file, latency, reruns, timeout, profile, barrier, results):
+    """
+    One simulated analyst in its own process (AppTest does not isolate sessions sharing a process):
+    a fresh session that reruns app.py `reruns` times once every session is warm.
+    """
+    from streamlit.testing.v1 import AppTest
+    db.DB_FILE = db_file
+    install_stubs(latency)
+    perf.enable()
+    if profile:
+        perf.instrument(bk, "bk")
+        perf.instrument(db, "db")
+
+    # The first run pays this process's imports and cache_resource setup, which a real server pays once
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.run()
+    latencies, errors, timings = [], [], {}
+    tracemalloc.start()
+    barrier.wait()
+    for _ in range(reruns):
+        # Timings are collected per rerun so failed reruns can be left out of every statistic
+        perf.reset()
+        start = time.perf_counter()
+        try:
+            at.run()
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        if at.exception:
+            errors.append(at.exception[0].message)
+            continue
+        latencies.append(time.perf_counter() - start)
+        for name, values in perf.timings().items():
+            timings.setdefault(name, []).extend(values)
+    _, peak = tracemalloc.get_traced_memory()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((latencies, errors, timings, peak / 1e6, rss))
+
+def run_load(sessions, reruns, latency=0.0, profile=False, timeout=120):
+    """
+    Drives `sessions` concurrent sessions, one process each, against the seeded DB.
+    Returns (latencies, errors, timings, wall seconds, max peak traced MB, max RSS MB) over successful reruns.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(sessions + 1), ctx.Queue()
+    procs = [ctx.Process(target=run_session, args=(db.DB_FILE, latency, reruns, timeout, profile, barrier, results))
+             for _ in range(sessions)]
+    for p in procs: p.start()
+    barrier.wait()
+    start = time.perf_counter()
+    outcomes = [results.get() for _ in procs]
+    wall = time.perf_counter() - start
+    for p in procs: p.join()
+
+    latencies, errors, timings = [], [], {}
+    for session_latencies, session_errors, session_timings, _, _ in outcomes:
+        latencies += session_latencies
+        errors += session_errors
+        for name, values in session_timings.items():
+            timings.setdefault(name, []).extend(values)
+    return latencies, errors, timings, wall, max(o[3] for o in outcomes), max(o[4] for o in outcomes)
+
+# --- REPORT ---
+
+def summarize(values):
+    ms = np.array(values) * 1000
+    return f"n={len(ms):<5} p50={np.percentile(ms, 50):8.1f}  p90={np.percentile(ms, 90):8.1f}  p99={np.percentile(ms, 99):8.1f}  max={ms.max():8.1f} ms"
+
+def print_report(latencies, errors, recorded, wall, peak_mb, rss_mb, profile=False, top=20):
+    print(f"Reruns:   {summarize(latencies)}" if latencies else "Reruns:   none completed")
+    print(f"Wall:     {wall:.1f}s ({len(latencies) / wall:.1f} successful reruns/s)")
+    print(f"Memory:   per session peak traced {peak_mb:.1f} MB, max RSS {rss_mb:.1f} MB")
+    if errors:
+        print(f"Errors:   {len(errors)} failed reruns, excluded above (first: {errors[0]})")
+
+    sections = {k.split(":", 1)[1]: v for k, v in recorded.items() if k.startswith("section:")}
+    if sections:
+        print("\nPer-section render time:")
+        for name, values in sorted(sections.items(), key=lambda kv: -sum(kv[1])):
+            print(f"  {name:<14} {summarize(values)}")
+
+    if profile:
+        calls = {k: v for k, v in recorded.items() if not k.startswith("section:")}
+        print(f"\nTop {top} bk.*/db.* calls by total time (inclusive):")
+        print(f"  {'call':<34} {'count':>7} {'total s':>9} {'mean ms':>9}")
+        for name, values in sorted(calls.items(), key=lambda kv: -sum(kv[1]))[:top]:
+            print(f"  {name:<34} {len(values):>7} {sum(values):>9.2f} {1000 * sum(values) / len(values):>9.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent Streamlit session load test for app.py")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent simulated sessions")
+    parser.add_argument("--reruns", type=int, default=5, help="Script reruns per session")
+    parser.add_argument("--stocks", type=int, default=5, help="Tracked stocks (tabs) in the seeded DB")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Seconds each stubbed fetch sleeps")
+    parser.add_argument("--profile", action="store_true", help="Attribute rerun time to individual bk.* and db.* calls")
+    args = parser.parse_args()
+
+    install_stubs(args.stub_latency)
+    seed_database(args.stocks)
+
+    print(f"{args.sessions} sessions (one process each) x {args.reruns} reruns, {args.stocks} stocks, "
+          f"stub latency {args.stub_latency * 1000:.0f} ms\n")
+    print_report(*run_load(args.sessions, args.reruns, args.stub_latency, args.profile), profile=args.profile)
@@ -1,18 +1,7 @@
-import os
 import numpy as np
 import yfinance as yf
-import praw
-from datetime import datetime, timezone
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from dotenv import load_dotenv
-from database import save_price, save_social, log_alert, get_recent_prices, get_recent_social
-
-load_dotenv()
-
-# --- CONFIG ---
-analyzer = SentimentIntensityAnalyzer()
-REDDIT_ID = os.getenv("REDDIT_CLIENT_ID")
-REDDIT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
+from database import save_price, log_alert, get_recent_prices
+from backend import ingest_reddit
 
 def get_market_data(ticker):
     """Fetch 1-minute interval price data"""
@@ -22,44 +11,16 @@ def get_market_data(ticker):
         hist = t.history(period="1d", interval="1m")
         if not hist.empty:
             row = hist.iloc[-1]
-            # Format Timestamp
-            ts = row.name.isoformat()
-            return {"ts": ts, "close": row["Close"], "volume": int(row["Volume"])}
+            return {"ts": row.name, "close": row["Close"], "volume": int(row["Volume"])}
     except Exception as e:
         print(f"Error fetching price for {ticker}: {e}")
     return None
 
 def get_reddit_data(ticker, keyword):
-    """Fetch recent posts from Reddit"""
-    if not REDDIT_ID:
-        print("Reddit keys missing!")
-        return []
-    
-    reddit = praw.Reddit(
-        client_id=REDDIT_ID,
-        client_secret=REDDIT_SECRET,
-        user_agent="Sentinel_App_v1"
-    )
-    
-    posts_found = []
-    # Search mostly Indian focused subreddits + generic ones
-    subs = ["IndianStreetBets", "DalalStreetTalks", "stocks"]
-    
+    """Fetch new Reddit posts through the shared multireddit ingestion stage"""
     print(f"Scanning Reddit for {keyword}...")
-    try:
-        for sub in subs:
-            for post in reddit.subreddit(sub).search(keyword, sort='new', time_filter='day', limit=5):
-                text = f"{post.title} {post.selftext}"[:500]
-                sentiment = analyzer.polarity_scores(text)['compound']
-                
-                # Check if we should save (simple dedup check could go here)
-                ts = datetime.fromtimestamp(post.created_utc).isoformat()
-                save_social(ticker, f"Reddit (r/{sub})", post.title, ts, sentiment)
-                posts_found.append(sentiment)
-    except Exception as e:
-        print(f"Reddit Error: {e}")
-        
-    return posts_found
+    new_posts = ingest_reddit([{"ticker": ticker, "search_term": keyword}])
+    return [p["sentiment"] for p in new_posts.get(ticker, [])]
 
 def analyze_ticker(ticker, keyword):
     """Run the full analysis pipeline for one stock"""
@@ -82,7 +43,7 @@ def analyze_ticker(ticker, keyword):
             if std_vol > 0:
                 z_score = (current_vol - mean_vol) / std_vol
                 if z_score > 3: # 3 Sigma Event
-                    log_alert(ticker, f"Volume Spike (Z={z_score:.2f})", z_score)
+                    log_alert(ticker, "ANOMALY", f"Volume Spike (Z={z_score:.2f})")
                     print(f"🚨 ALERT: Volume Spike for {ticker}")
 
     # 3. Sentiment Check
@@ -90,7 +51,7 @@ def analyze_ticker(ticker, keyword):
     if sentiments:
         avg_sent = np.mean(sentiments)
         if abs(avg_sent) > 0.4: # Strong Sentiment
-            log_alert(ticker, f"High Social Sentiment ({avg_sent:.2f})", avg_sent)
+            log_alert(ticker, "SENTIMENT", f"High Social Sentiment ({avg_sent:.2f})")
             print(f"🚨 ALERT: Sentiment Spike for {ticker}")
             
     return "Done"
\ No newline at end of file
@@ -0,0 +1,67 @@
+import functools
+import inspect
+import threading
+import time
+
+# Lightweight render profiling. Disabled (near no-op) unless a harness such as
+# loadtest.py calls enable(); the dashboard only drops section marks.
+
+ENABLED = False
+_lock = threading.Lock()
+_timings = {}       # name -> list of seconds
+_local = threading.local()
+_generation = 0     # Bumped by reset() so a section left open by an aborted run is discarded
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+def reset():
+    global _generation
+    with _lock:
+        _timings.clear()
+        _generation += 1
+
+def record(name, seconds):
+    with _lock:
+        _timings.setdefault(name, []).append(seconds)
+
+def timings():
+    """Snapshot of every recorded duration: {name: [seconds, ...]}."""
+    with _lock:
+        return {name: list(values) for name, values in _timings.items()}
+
+def mark(section):
+    """
+    Starts timing `section` on this script run and closes the previous one.
+    Pass None at the end of the script to close the last section.
+    """
+    if not ENABLED: return
+    now = time.perf_counter()
+    current = getattr(_local, "section", None)
+    if current and current[2] == _generation:
+        record(f"section:{current[0]}", now - current[1])
+    _local.section = (section, now, _generation) if section else None
+
+def instrument(module, prefix):
+    """
+    Wraps every public function of `module` so each call is recorded as '<prefix>.<name>'.
+    Only calls made inside a marked script run count; background threads (e.g. the alert relay) are ignored.
+    """
+    for name, fn in list(vars(module).items()):
+        if name.startswith("_") or not inspect.isfunction(fn) or getattr(fn, "_perf_wrapped", False):
+            continue
+        setattr(module, name, _timed(fn, f"{prefix}.{name}"))
+
+def _timed(fn, label):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, "section", None) is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(label, time.perf_counter() - start)
+    wrapper._perf_wrapped = True
+    return wrapper
@@ -0,0 +1,122 @@
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as dtime
+from zoneinfo import ZoneInfo
+import backend as bk
+
+# --- NSE TRADING CALENDAR ---
+
+IST = ZoneInfo("Asia/Kolkata")
+MARKET_OPEN = dtime(9, 15)
+MARKET_CLOSE = dtime(15, 30)
+
+# Weekday trading holidays from the NSE circulars; extend every December
+NSE_HOLIDAYS = {
+    date(2025, 2, 26), date(2025, 3, 14), date(2025, 3, 31), date(2025, 4, 10),
+    date(2025, 4, 14), date(2025, 4, 18), date(2025, 5, 1), date(2025, 8, 15),
+    date(2025, 8, 27), date(2025, 10, 2), date(2025, 10, 21), date(2025, 10, 22),
+    date(2025, 11, 5), date(2025, 12, 25),
+    date(2026, 1, 26), date(2026, 3, 3), date(2026, 3, 26), date(2026, 3, 31),
+    date(2026, 4, 3), date(2026, 4, 14), date(2026, 5, 1), date(2026, 5, 28),
+    date(2026, 6, 26), date(2026, 9, 14), date(2026, 10, 2), date(2026, 10, 20),
+    date(2026, 11, 10), date(2026, 11, 24), date(2026, 12, 25),
+}
+
+def is_trading_day(d):
+    return d.weekday() < 5 and d not in NSE_HOLIDAYS
+
+def is_market_open(now=None):
+    now = (now or datetime.now(IST)).astimezone(IST)
+    return is_trading_day(now.date()) and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+def next_market_open(now=None):
+    """The next session open strictly after `now` (today's open if it hasn't happened yet)."""
+    now = (now or datetime.now(IST)).astimezone(IST)
+    d = now.date()
+    if now.time() >= MARKET_OPEN:
+        d += timedelta(days=1)
+    while not is_trading_day(d):
+        d += timedelta(days=1)
+    return datetime.combine(d, MARKET_OPEN, tzinfo=IST)
+
+# --- ADAPTIVE CADENCE ---
+
+# Base seconds between polls per source and session (None = wait for the next open)
+BASE_CADENCE = {
+    "price": {"open": 60, "closed": None},
+    "news": {"open": 300, "closed": 1800},
+    "reddit": {"open": 300, "closed": 1800},
+}
+MIN_INTERVAL = {"price": 60, "news": 120, "reddit": 120}
+MIN_FACTOR, MAX_FACTOR = 0.5, 4.0
+
+# What counts as "hot" / "quiet" activity (new items per poll). Prices are not adaptive: every
+# minute bar must reach market_data so the 20-row anomaly window always spans 20 minutes.
+HOT_ACTIVITY = {"news": 3, "reddit": 3}
+QUIET_ACTIVITY = {"news": 0, "reddit": 0}
+
+class PollScheduler:
+    """
+    Tracks when each (ticker, source) is next due. The interval follows the exchange
+    session; news and Reddit polls also shrink for hot tickers and grow for quiet ones.
+    """
+
+    def __init__(self):
+        self.next_due = {}
+        self.factor = {}
+
+    def due(self, ticker, source, now=None):
+        return (now or time.time()) >= self.next_due.get((ticker, source), 0)
+
+    def interval(self, ticker, source, now=None):
+        """Seconds until the next poll, or None if it should wait for the next session open."""
+        base = BASE_CADENCE[source]["open" if is_market_open(now) else "closed"]
+        if base is None: return None
+        return max(MIN_INTERVAL[source], base * self.factor.get((ticker, source), 1.0))
+
+    def record(self, ticker, source, activity, now=None):
+        """Updates the ticker's heat from the poll result and schedules its next poll."""
+        key = (ticker, source)
+        factor = self.factor.get(key, 1.0)
+        if source not in HOT_ACTIVITY:
+            factor = 1.0
+        elif abs(activity) >= HOT_ACTIVITY[source]:
+            factor = max(MIN_FACTOR, factor / 2)
+        elif abs(activity) <= QUIET_ACTIVITY[source]:
+            factor = min(MAX_FACTOR, factor * 1.5)
+        else:
+            factor = 1.0
+        self.factor[key] = factor
+
+        ts = now or time.time()
+        wait = self.interval(ticker, source, datetime.fromtimestamp(ts, IST))
+        if wait is None:
+            self.next_due[key] = next_market_open(datetime.fromtimestamp(ts, IST)).timestamp()
+        else:
+            self.next_due[key] = ts + wait
+
+    def seconds_until_next(self, tickers, now=None):
+        """Time until the earliest scheduled poll among `tickers` (0 if any is due or unscheduled)."""
+        now = now or time.time()
+        dues = [self.next_due.get((t, s), 0) for t in tickers for s in BASE_CADENCE]
+        return max(0.0, min(dues) - now) if dues else 0.0
+
+def run_due(stocks, scheduler):
+    """Polls only the (ticker, source) pairs that are due. Returns a short status line."""
+    polled = []
+    # Reddit is fetched for all due tickers at once (one multireddit query per batch)
+    reddit_due = [s for s in stocks if scheduler.due(s['ticker'], "reddit")]
+    if reddit_due:
+        new_posts = bk.ingest_reddit(reddit_due)
+        for stock in reddit_due:
+            scheduler.record(stock['ticker'], "reddit", len(new_posts.get(stock['ticker'], [])))
+
+    for stock in stocks:
+        ticker = stock['ticker']
+        if scheduler.due(ticker, "price"):
+            price, z = bk.process_market(stock)
+            scheduler.record(ticker, "price", z)
+            polled.append(f"{ticker}: ₹{price:.2f}" if price else f"{ticker}: N/A")
+        if scheduler.due(ticker, "news"):
+            scheduler.record(ticker, "news", bk.process_news(stock))
+    return " | ".join(polled) if polled else "Nothing due."
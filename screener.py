@@ -0,0 +1,115 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import yfinance as yf
+import database as db
+import alert_stream
+from universe import load_universe
+
+# Mirrors backend.detect_anomalies: last 20 volumes (current included), at least 5, population std
+WINDOW = 20
+MIN_HISTORY = 5
+DEFAULT_THRESH = 3.0
+BAR = pd.Timedelta(minutes=1)
+
+def fetch_universe_volumes(tickers, period="1d"):
+    """Downloads 1-minute volumes for the whole universe in one batched call (bars x tickers)."""
+    try:
+        data = yf.download(tickers, period=period, interval="1m", progress=False, threads=True, auto_adjust=False)
+    except Exception as e:
+        print(f"Error downloading universe volumes: {e}")
+        return None
+    if data is None or data.empty: return None
+
+    vols = data["Volume"]
+    if isinstance(vols, pd.Series):
+        vols = vols.to_frame(tickers[0])
+    return vols.reindex(columns=tickers)
+
+class VolumeScreener:
+    """
+    Keeps a tickers x WINDOW matrix of minute volumes in memory and z-scores
+    the whole universe in one vectorized pass.
+    """
+
+    def __init__(self, tickers, window=WINDOW):
+        self.tickers = list(tickers)
+        self.window = window
+        self.volumes = np.full((len(self.tickers), window), np.nan)
+        self.pos = np.zeros(len(self.tickers), dtype=int)
+        self.current = np.full(len(self.tickers), np.nan)
+        self.last_bar = None
+
+    def push(self, latest):
+        """Appends one bar of volumes. Tickers without a bar keep their window untouched."""
+        latest = np.asarray(latest, dtype=float)
+        rows = np.flatnonzero(np.isfinite(latest))
+        self.volumes[rows, self.pos[rows]] = latest[rows]
+        self.pos[rows] = (self.pos[rows] + 1) % self.window
+        self.current = latest
+
+    def update(self, frame, now=None):
+        """Feeds any completed bars newer than the last one seen. Returns True if something was pushed."""
+        if frame is None or frame.empty: return False
+        # The live download ends with the minute still in progress; its partial volume would bias z low
+        now = now or pd.Timestamp.now(tz=frame.index.tz)
+        frame = frame[frame.index + BAR < now]
+        new = frame if self.last_bar is None else frame[frame.index > self.last_bar]
+        if new.empty: return False
+
+        for row in new.iloc[-self.window:].to_numpy(dtype=float):
+            self.push(row)
+        self.last_bar = new.index[-1]
+        return True
+
+    def zscores(self):
+        """Z-score of the current volume against each ticker's window (0.0 where undefined)."""
+        mask = np.isfinite(self.volumes)
+        counts = mask.sum(axis=1)
+        n = np.maximum(counts, 1)
+        mean = np.where(mask, self.volumes, 0.0).sum(axis=1) / n
+        std = np.sqrt((np.where(mask, self.volumes - mean[:, None], 0.0) ** 2).sum(axis=1) / n)
+
+        valid = (counts >= MIN_HISTORY) & (std > 0) & np.isfinite(self.current)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (self.current - mean) / std
+        return np.where(valid, z, 0.0)
+
+    def scan(self, thresholds):
+        """Returns (ticker, z, threshold) for every ticker whose z exceeds its threshold."""
+        z = self.zscores()
+        thresh = np.array([thresholds.get(t, DEFAULT_THRESH) for t in self.tickers], dtype=float)
+        hits = np.flatnonzero(z > thresh)
+        return [(self.tickers[i], float(z[i]), float(thresh[i])) for i in hits]
+
+def get_thresholds():
+    """Per-ticker anomaly thresholds from tracked stocks; everything else uses DEFAULT_THRESH."""
+    return {s['ticker']: s.get('anomaly_thresh', DEFAULT_THRESH) for s in db.get_tracked_stocks()}
+
+def run_screener(tickers, interval=60, once=False):
+    """Screens the universe every `interval` seconds and logs only the resulting alerts."""
+    screener = VolumeScreener(tickers)
+    while True:
+        frame = fetch_universe_volumes(tickers)
+        start = time.perf_counter()
+        if screener.update(frame):
+            hits = screener.scan(get_thresholds())
+            db.log_alerts([(t, "ANOMALY", f"Volume Spike (Z={z:.2f} > {th})") for t, z, th in hits])
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"Screened {len(tickers)} tickers in {elapsed:.1f} ms: {len(hits)} alerts")
+        if once: return
+        time.sleep(interval)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Universe-scale volume anomaly screener")
+    parser.add_argument("--universe", help="NSE constituents CSV or watchlist file (defaults to Nifty 50)")
+    parser.add_argument("--interval", type=int, default=60, help="Seconds between scans")
+    parser.add_argument("--once", action="store_true", help="Run a single scan and exit")
+    parser.add_argument("--stream", action="store_true", help="Serve the SSE alert stream / webhooks from this process")
+    args = parser.parse_args()
+
+    db.init_db()
+    if args.stream:
+        alert_stream.start_services()
+    run_screener(load_universe(args.universe), interval=args.interval, once=args.once)
@@ -0,0 +1,59 @@
+import os
+import socket
+import time
+import zlib
+import database as db
+
+# Tickers hash into a fixed number of shards; workers lease shards, not tickers,
+# so adding a stock never reshuffles ownership.
+NUM_SHARDS = 32
+LEASE_SECONDS = 180     # Must comfortably exceed one pipeline cycle
+
+def shard_of(ticker):
+    """Stable shard id for a ticker (same in every process, unlike hash())."""
+    return zlib.crc32(ticker.upper().encode()) % NUM_SHARDS
+
+def fair_share(worker_id, live_workers, num_shards=NUM_SHARDS):
+    """Shards this worker should hold: an even split, with the remainder going to the first workers."""
+    if worker_id not in live_workers:
+        live_workers = sorted(live_workers + [worker_id])
+    base, extra = divmod(num_shards, len(live_workers))
+    return base + (1 if live_workers.index(worker_id) < extra else 0)
+
+class ShardLeaser:
+    """Claims, renews and releases this worker's shard leases in the DB."""
+
+    def __init__(self, worker_id=None, lease_seconds=LEASE_SECONDS, num_shards=NUM_SHARDS):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.num_shards = num_shards
+        self.owned = set()
+        db.ensure_shards(num_shards)
+
+    def rebalance(self):
+        """
+        Heartbeats, renews held leases, hands back surplus shards when workers join
+        and picks up free or expired ones when workers leave. Returns the owned shards.
+        """
+        now = time.time()
+        expires = now + self.lease_seconds
+        db.heartbeat_worker(self.worker_id, now)
+        live = db.get_live_workers(now - self.lease_seconds)
+        target = fair_share(self.worker_id, live, self.num_shards)
+
+        owned = db.renew_shards(self.worker_id, expires)
+        if len(owned) > target:
+            db.release_shards(self.worker_id, owned[target:])
+        elif len(owned) < target:
+            db.claim_shards(self.worker_id, target - len(owned), now, expires)
+
+        self.owned = set(db.renew_shards(self.worker_id, expires))
+        return self.owned
+
+    def owns(self, ticker):
+        return shard_of(ticker) in self.owned
+
+    def release_all(self):
+        """Gives every shard back immediately so other workers don't wait for expiry."""
+        db.remove_worker(self.worker_id)
+        self.owned = set()
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+import database as db
+import export
+
+
+def test_export_mixes_timestamp_formats(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "sentinel_data.db"))
+    db.init_db()
+    aware = datetime(2026, 10, 19, 9, 16, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    db.bulk_insert_market_data([
+        ("TCS.NS", datetime(2026, 10, 19, 9, 15), 100.0, 10),            # naive datetime (live pipeline)
+        ("TCS.NS", datetime(2026, 10, 19, 9, 15, 30, 250000), 100.5, 5),  # naive with microseconds
+        ("TCS.NS", aware.isoformat(), 101.0, 20),                         # tz-aware 'T' text (older rows)
+    ])
+
+    table, next_cursor = export.export_table("market_data")
+
+    assert next_cursor is None
+    assert table.column("timestamp").to_pylist() == [
+        datetime(2026, 10, 19, 9, 15),
+        datetime(2026, 10, 19, 9, 15, 30, 250000),
+        aware.astimezone().replace(tzinfo=None),
+    ]
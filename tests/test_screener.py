@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+import database as db
+import backend as bk
+from screener import VolumeScreener
+
+
+def test_screener_matches_detect_anomalies(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "sentinel_data.db"))
+    db.init_db()
+    rng = np.random.default_rng(7)
+    volumes = {
+        "SPIKE.NS": np.r_[rng.integers(900, 1100, 29), 9000].astype(float),   # Longer than the window
+        "CALM.NS": rng.integers(900, 1100, 12).astype(float),
+        "FEW.NS": np.array([1000.0, 5000.0, 800.0]),                        # Under 5 samples
+        "FLAT.NS": np.full(10, 1000.0),                                     # Zero std
+    }
+    tickers = list(volumes)
+    screener = VolumeScreener(tickers)
+    start = datetime(2026, 10, 19, 9, 15)
+    rows = []
+    n = max(len(v) for v in volumes.values())
+    for i in range(n):
+        # Series are right-aligned so every ticker's last volume lands in the final push
+        bar = [v[i - (n - len(v))] if i >= n - len(v) else np.nan for v in volumes.values()]
+        screener.push(bar)
+        rows += [(t, start + timedelta(minutes=i), 100.0, int(b)) for t, b in zip(tickers, bar) if np.isfinite(b)]
+    db.bulk_insert_market_data(rows)
+
+    z = screener.zscores()
+    hits = {t for t, _, _ in screener.scan({})}
+    for i, t in enumerate(tickers):
+        expected_hit, expected_z = bk.detect_anomalies(t, volumes[t][-1])
+        assert z[i] == pytest.approx(expected_z)
+        assert (t in hits) == expected_hit
+
+    assert "SPIKE.NS" in hits
+    assert z[tickers.index("FLAT.NS")] == 0.0
+    assert z[tickers.index("FEW.NS")] == 0.0
@@ -0,0 +1,48 @@
+import csv
+import os
+
+# Default universe: Nifty 50 constituents (Yahoo Finance symbols)
+NIFTY_50 = [
+    "ADANIENT.NS", "ADANIPORTS.NS", "APOLLOHOSP.NS", "ASIANPAINT.NS", "AXISBANK.NS",
+    "BAJAJ-AUTO.NS", "BAJFINANCE.NS", "BAJAJFINSV.NS", "BEL.NS", "BHARTIARTL.NS",
+    "CIPLA.NS", "COALINDIA.NS", "DRREDDY.NS", "EICHERMOT.NS", "ETERNAL.NS",
+    "GRASIM.NS", "HCLTECH.NS", "HDFCBANK.NS", "HDFCLIFE.NS", "HEROMOTOCO.NS",
+    "HINDALCO.NS", "HINDUNILVR.NS", "ICICIBANK.NS", "INDUSINDBK.NS", "INFY.NS",
+    "ITC.NS", "JIOFIN.NS", "JSWSTEEL.NS", "KOTAKBANK.NS", "LT.NS",
+    "M&M.NS", "MARUTI.NS", "NESTLEIND.NS", "NTPC.NS", "ONGC.NS",
+    "POWERGRID.NS", "RELIANCE.NS", "SBILIFE.NS", "SBIN.NS", "SHRIRAMFIN.NS",
+    "SUNPHARMA.NS", "TATACONSUM.NS", "TATAMOTORS.NS", "TATASTEEL.NS", "TCS.NS",
+    "TECHM.NS", "TITAN.NS", "TRENT.NS", "ULTRACEMCO.NS", "WIPRO.NS",
+]
+
+def to_yahoo_symbol(symbol, suffix=".NS"):
+    """Normalizes an NSE symbol (e.g. 'RELIANCE') to its Yahoo Finance form."""
+    symbol = symbol.strip().upper()
+    if not symbol or symbol.startswith("^") or "." in symbol:
+        return symbol
+    return f"{symbol}{suffix}"
+
+def load_universe(path=None):
+    """
+    Loads a ticker universe from an NSE index constituents CSV (e.g. ind_nifty500list.csv)
+    or a plain watchlist file with one ticker per line. The path defaults to
+    SENTINEL_UNIVERSE_FILE; without a file the built-in Nifty 50 list is used.
+    """
+    path = path or os.getenv("SENTINEL_UNIVERSE_FILE")
+    if not path or not os.path.exists(path):
+        return list(NIFTY_50)
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        lines = [line for line in f if line.strip()]
+    if not lines:
+        return list(NIFTY_50)
+
+    # NSE constituent CSVs carry a 'Symbol' column; plain watchlists are one ticker per line
+    header = [h.strip().lower() for h in lines[0].split(",")]
+    if "symbol" in header:
+        symbols = [row.get("Symbol") or row.get("symbol") for row in csv.DictReader(lines)]
+    else:
+        symbols = [line.split(",")[0] for line in lines]
+
+    tickers = [to_yahoo_symbol(s) for s in symbols if s]
+    return list(dict.fromkeys(t for t in tickers if t)) or list(NIFTY_50)
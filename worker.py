@@ -0,0 +1,51 @@
+import argparse
+import threading
+import time
+import database as db
+import alert_stream
+import backend as bk
+from sharding import ShardLeaser
+from scheduler import PollScheduler, run_due
+
+TICK_SECONDS = 30      # Upper bound on sleep, so leases are renewed well before they expire
+
+def run_worker(worker_id=None):
+    """
+    Headless ingestion loop: each tick polls only the tickers in this worker's leased shards
+    that the market-hours scheduler says are due.
+    """
+    leaser = ShardLeaser(worker_id)
+    scheduler = PollScheduler()
+    peer_refresh = None
+    print(f"Worker {leaser.worker_id} started")
+    try:
+        while True:
+            tickers = []
+            try:
+                owned = leaser.rebalance()
+                stocks = [s for s in db.get_tracked_stocks() if leaser.owns(s['ticker'])]
+                tickers = [s['ticker'] for s in stocks]
+                # Shard 0's owner also keeps the shared peer map fresh. A full refresh can outlast
+                # LEASE_SECONDS, so it runs beside the loop that renews the leases
+                if 0 in owned and (peer_refresh is None or not peer_refresh.is_alive()):
+                    peer_refresh = threading.Thread(target=bk.maybe_refresh_peer_map, name="peer-refresh", daemon=True)
+                    peer_refresh.start()
+                status = run_due(stocks, scheduler) if stocks else "Idle"
+                print(f"[{leaser.worker_id}] {len(owned)} shards, {len(stocks)} tickers: {status}")
+            except Exception as e:
+                print(f"[{leaser.worker_id}] Cycle failed: {e}")
+            wait = scheduler.seconds_until_next(tickers) if tickers else TICK_SECONDS
+            time.sleep(min(TICK_SECONDS, max(1.0, wait)))
+    finally:
+        leaser.release_all()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded ingestion worker (run one per container)")
+    parser.add_argument("--worker-id", help="Defaults to <hostname>-<pid>")
+    parser.add_argument("--stream", action="store_true", help="Serve the SSE alert stream / webhooks from this process (headless deployments)")
+    args = parser.parse_args()
+
+    db.init_db()
+    if args.stream:
+        alert_stream.start_services()
+    run_worker(worker_id=args.worker_id)